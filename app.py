@@ -1,14 +1,56 @@
-from flask import Flask,request,render_template
+import io
+import os
+
+from flask import Flask,request,render_template,jsonify,Response,stream_with_context
 import numpy as np
 import pandas as pd
 
 from sklearn.preprocessing import StandardScaler
-from src.pipeline.predict_pipeline import CustomData,PredictPipeline
+from src.pipeline.predict_pipeline import CustomData,PredictPipeline,get_records_as_data_frame,FEATURE_COLUMNS
+from src.pipeline.model_registry import get_model_registry
+from src.pipeline.micro_batcher import MicroBatcher,MicroBatcherConfig
+from src.pipeline.prediction_cache import PredictionCache,PredictionCacheConfig
+from src.pipeline.metrics import serving_metrics
+from src.schema import STUDENT_SCHEMA
+from src.exception import CustomException
 
 application=Flask(__name__)
 
 app=application
 
+## Upper bound on the number of students scored by one /predict/batch call
+app.config['PREDICT_MAX_BATCH_SIZE']=int(os.environ.get('PREDICT_MAX_BATCH_SIZE',10000))
+## Rows parsed and scored at a time by /predict/csv
+app.config['PREDICT_CSV_CHUNK_SIZE']=int(os.environ.get('PREDICT_CSV_CHUNK_SIZE',10000))
+
+## Load the model and preprocessor once and watch them for retrained versions
+model_registry=get_model_registry()
+model_registry.get()
+model_registry.start_watcher()
+
+## Prediction cache in front of the form path, PREDICT_CACHE_SIZE=0 disables it
+prediction_cache=None
+if int(os.environ.get('PREDICT_CACHE_SIZE',10000))>0:
+    cache_ttl=os.environ.get('PREDICT_CACHE_TTL_SECONDS')
+    prediction_cache=PredictionCache(
+        PredictionCacheConfig(
+            max_size=int(os.environ.get('PREDICT_CACHE_SIZE',10000)),
+            ttl_seconds=float(cache_ttl) if cache_ttl else None
+        )
+    )
+predict_pipeline=PredictPipeline(registry=model_registry,cache=prediction_cache)
+
+## Opt-in micro-batching of concurrent /predictdata requests
+micro_batcher=None
+if os.environ.get('PREDICT_MICRO_BATCHING','0')=='1':
+    micro_batcher=MicroBatcher(
+        predict_pipeline.predict,
+        MicroBatcherConfig(
+            max_batch_size=int(os.environ.get('PREDICT_MICRO_BATCH_MAX_SIZE',64)),
+            max_wait_ms=float(os.environ.get('PREDICT_MICRO_BATCH_WAIT_MS',2.0))
+        )
+    )
+
 ## Route for a home page
 
 @app.route('/')
@@ -20,25 +62,124 @@ def predict_datapoint():
     if request.method=='GET':
         return render_template('home.html')
     else:
-        data=CustomData(
-            gender=request.form.get('gender'),
-            race_ethnicity=request.form.get('ethnicity'),
-            parental_level_of_education=request.form.get('parental_level_of_education'),
-            lunch=request.form.get('lunch'),
-            test_preparation_course=request.form.get('test_preparation_course'),
-            reading_score=float(request.form.get('writing_score')),
-            writing_score=float(request.form.get('reading_score'))
+        serving_metrics.increment('requests.predictdata')
+        with serving_metrics.time('request.predictdata'):
+            with serving_metrics.time('form_parse'):
+                data=CustomData(
+                    gender=request.form.get('gender'),
+                    race_ethnicity=request.form.get('ethnicity'),
+                    parental_level_of_education=request.form.get('parental_level_of_education'),
+                    lunch=request.form.get('lunch'),
+                    test_preparation_course=request.form.get('test_preparation_course'),
+                    reading_score=float(request.form.get('writing_score')),
+                    writing_score=float(request.form.get('reading_score'))
+
+                )
+
+            ## Cache hits are answered here; only misses are queued on the micro-batcher
+            results=predict_pipeline.predict_record(data.get_data_as_dict(),micro_batcher=micro_batcher)
+
+            with serving_metrics.time('template_render'):
+                return render_template('home.html',results=results[0])
+
+@app.route('/predict/batch',methods=['POST'])
+def predict_batch():
+    payload=request.get_json(silent=True)
+    records=payload.get('records') if isinstance(payload,dict) else payload
+    if not isinstance(records,list):
+        return jsonify(error="Expected a JSON array of student records"),400
 
+    max_batch_size=app.config['PREDICT_MAX_BATCH_SIZE']
+    if len(records)>max_batch_size:
+        return jsonify(error=f"Batch of {len(records)} records exceeds the limit of {max_batch_size}"),413
+    if not records:
+        return jsonify(predictions=[])
+
+    serving_metrics.increment('requests.predict_batch')
+    with serving_metrics.time('request.predict_batch'):
+        try:
+            with serving_metrics.time('dataframe_build'):
+                pred_df=get_records_as_data_frame(records)
+            predict_pipeline.validate_categories(pred_df)
+        except ValueError as e:
+            return jsonify(error=str(e)),400
+
+        ## One transform and one predict call for the whole cohort
+        try:
+            results=predict_pipeline.predict(pred_df)
+        except CustomException as e:
+            ## Any other input the fitted preprocessor rejects is still the client's error
+            if isinstance(e.error_message,ValueError):
+                return jsonify(error=str(e.error_message)),400
+            raise
+        serving_metrics.increment('rows_scored',len(records))
+        return jsonify(predictions=results.tolist())
+
+@app.route('/predict/csv',methods=['POST'])
+def predict_csv():
+    ## The CSV is the raw request body (e.g. curl --data-binary @roster.csv), read
+    ## straight off the socket; a multipart upload would be spooled in full first.
+    try:
+        reader=STUDENT_SCHEMA.read_csv(
+            io.TextIOWrapper(request.stream,encoding='utf-8',newline=''),
+            columns=FEATURE_COLUMNS,
+            model_input=True,
+            chunksize=app.config['PREDICT_CSV_CHUNK_SIZE']
         )
-        pred_df=data.get_data_as_data_frame()
-        print(pred_df)
-        print("Before Prediction")
-
-        predict_pipeline=PredictPipeline()
-        print("Mid Prediction")
-        results=predict_pipeline.predict(pred_df)
-        print("after Prediction")
-        return render_template('home.html',results=results[0])
+    except (ValueError,pd.errors.ParserError) as e:
+        return jsonify(error=f"Invalid student CSV: {e}"),400
+
+    serving_metrics.increment('requests.predict_csv')
+
+    def score(chunk):
+        results=predict_pipeline.predict(chunk[FEATURE_COLUMNS])
+        serving_metrics.increment('rows_scored',len(chunk))
+        return pd.DataFrame({'math_score':results}).to_csv(header=False,index=False)
+
+    ## The first chunk is scored before the 200 goes out, so a bad file still gets a 400
+    try:
+        first_chunk=next(reader,pd.DataFrame(columns=FEATURE_COLUMNS))
+        first=score(first_chunk)
+    except Exception as e:
+        app.logger.error(f"CSV scoring failed: {e!r}")
+        return jsonify(error=f"Invalid student CSV: {getattr(e,'error_message',e)}"),400
+
+    def generate():
+        yield "math_score\n"
+        yield first
+        rows=len(first_chunk)
+        try:
+            for chunk in reader:
+                output=score(chunk)
+                rows+=len(chunk)
+                yield output
+        except Exception as e:
+            ## The status line is already sent: end with a marker so the partial
+            ## output is never mistaken for a complete result.
+            app.logger.error(f"CSV scoring failed after {rows} rows: {e!r}")
+            yield f"#error: scoring stopped after {rows} rows: {getattr(e,'error_message',e)}\n"
+
+    return Response(stream_with_context(generate()),mimetype='text/csv')
+
+@app.route('/metrics')
+def metrics():
+    report=serving_metrics.snapshot()
+    report['cache']=prediction_cache.stats() if prediction_cache is not None else None
+    report['batcher']=micro_batcher.stats() if micro_batcher is not None else None
+    report['model_version']=model_registry.get().version
+    return jsonify(report)
+
+@app.route('/metrics/cache')
+def cache_metrics():
+    if prediction_cache is None:
+        return jsonify(enabled=False)
+    return jsonify(enabled=True,**prediction_cache.stats())
+
+@app.route('/metrics/batcher')
+def batcher_metrics():
+    if micro_batcher is None:
+        return jsonify(enabled=False)
+    return jsonify(enabled=True,**micro_batcher.stats())
     
 
 if __name__=="__main__":
@@ -0,0 +1,79 @@
+"""
+Compares the intermediate artifact formats on a large synthetic student table.
+
+    python benchmarks/artifact_formats.py --rows 1000000
+
+Rows are sampled with replacement from data/stud.csv. For CSV (written with
+the index, as the ingestion stage used to) and each columnar format it reports
+write time, read time, size on disk and whether the dtypes survive the round
+trip.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.components.frame_store import FORMATS, HAS_PYARROW, read_frame, read_table, write_frame  # noqa: E402
+from src.schema import STUDENT_SCHEMA  # noqa: E402
+
+
+def _size_mb(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)) / 2 ** 20
+    return os.path.getsize(path) / 2 ** 20
+
+
+def _best_of(repeats, fn):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--source", default=os.path.join("data", "stud.csv"))
+    args = parser.parse_args(argv)
+
+    frame = STUDENT_SCHEMA.read_csv(args.source).sample(n=args.rows, replace=True, random_state=42)
+
+    workdir = tempfile.mkdtemp(prefix="artifact_formats_")
+    try:
+        rows = []
+        csv_path = os.path.join(workdir, "train.cv")
+        write_seconds, _ = _best_of(args.repeats, lambda: frame.to_csv(csv_path, index=True, header=True))
+        # Plain pandas inference, as the transformation stage used to parse the CSV files.
+        read_seconds, restored = _best_of(args.repeats, lambda: read_table(csv_path))
+        rows.append(("csv", write_seconds, read_seconds, _size_mb(csv_path),
+                     restored.dtypes.equals(frame.dtypes)))
+
+        for format in FORMATS:
+            if format == "feather" and not HAS_PYARROW:
+                continue
+            path = os.path.join(workdir, format)
+            write_seconds, _ = _best_of(args.repeats, lambda: write_frame(frame, path, format))
+            read_seconds, restored = _best_of(args.repeats, lambda: read_frame(path))
+            rows.append((format, write_seconds, read_seconds, _size_mb(path),
+                         restored.dtypes.equals(frame.dtypes)))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{args.rows} rows, best of {args.repeats}")
+    print(f"{'format':<8} {'write s':>9} {'read s':>9} {'size MB':>9} {'read speedup':>13}  dtypes kept")
+    csv_read = rows[0][2]
+    for format, write_seconds, read_seconds, size_mb, dtypes_kept in rows:
+        print(f"{format:<8} {write_seconds:>9.3f} {read_seconds:>9.3f} {size_mb:>9.1f} "
+              f"{csv_read / read_seconds:>12.1f}x  {dtypes_kept}")
+
+
+if __name__ == "__main__":
+    main()
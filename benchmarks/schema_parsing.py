@@ -0,0 +1,59 @@
+"""
+Compares parsing a large student CSV with pandas' dtype inference against
+the schema registry's declared dtypes.
+
+    python benchmarks/schema_parsing.py --rows 2000000
+
+Rows are sampled with replacement from data/stud.csv into a temporary CSV.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.schema import STUDENT_SCHEMA  # noqa: E402
+
+
+def _best_of(repeats, fn):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--source", default=os.path.join("data", "stud.csv"))
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="schema_parsing_")
+    try:
+        path = os.path.join(workdir, "students.csv")
+        pd.read_csv(args.source).sample(n=args.rows, replace=True, random_state=42).to_csv(path, index=False)
+
+        results = [
+            ("inferred",) + _best_of(args.repeats, lambda: pd.read_csv(path)),
+            ("schema",) + _best_of(args.repeats, lambda: STUDENT_SCHEMA.read_csv(path)),
+        ]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{args.rows} rows, best of {args.repeats}")
+    print(f"{'dtypes':<9} {'parse s':>9} {'memory MB':>10}")
+    for name, seconds, frame in results:
+        print(f"{name:<9} {seconds:>9.3f} {frame.memory_usage(deep=True).sum() / 2 ** 20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,128 @@
+import hashlib
+import json
 import os
-import sys
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 from src.exception import CustomException  # Importing the class and methods from src/exception.py
 from src.logger import logging  # Assuming a logging module for structured logging
+import numpy as np
 import pandas as pd
 
 from sklearn.model_selection import train_test_split
-from src.components.data_transformation import DataTransformation, DataTransformationConfig
-from dataclasses import dataclass
-from src.components.model_trainer import ModelTrainer
-from src.components.model_trainer import ModelTrainerConfig  
+from src.components.data_sources import (SOURCE_TYPES, CSVSource, SQLiteSource, SQLiteSourceConfig,
+                                          is_sharded_source, list_source_files)
+from src.components.frame_store import (iter_frames, list_parts, replace_dataset, resolve_format, write_frame,
+                                        write_part)
+from src.schema import STUDENT_SCHEMA
+from dataclasses import dataclass, field
 
 
 # Data Ingestion Configuration (Optional)
 @dataclass
 class DataIngestionConfig:
-    train_data_path :str = os.path.join('artifacts' , 'train.cv')
-    test_data_path :str = os.path.join('artifacts' , 'test.cv')
-    raw_data_path:str = os.path.join('artifacts' , 'data.cv')
+    # A CSV file, or a directory / glob of CSV shards ingested in parallel
+    source_data_path: str = os.path.join('data', 'stud.csv')
+    # "csv" reads source_data_path, "sqlite" the table described by `sqlite`
+    source_type: str = "csv"
+    sqlite: SQLiteSourceConfig = field(default_factory=SQLiteSourceConfig)
+    test_size: float = 0.33
+    # "in_memory" loads the whole file and uses train_test_split; "streaming"
+    # reads `chunk_size` rows at a time and splits each row by a hash of
+    # `split_key_columns` (None: every column), appending chunk by chunk;
+    ingestion_mode: str = "in_memory"
+    chunk_size: int = 100000
+    split_key_columns: tuple = None
+    # Worker processes parsing shards concurrently (1: sequential, -1: all cores)
+    n_jobs: int = -1
+    # "incremental" splits like "streaming" but only reads the rows appended
+    # since the watermark recorded here
+    ingestion_state_path: str = os.path.join('artifacts', 'ingestion_state.json')
+    # Columnar datasets (see src/components/frame_store.py)
+    train_data_path :str = os.path.join('artifacts' , 'train')
+    test_data_path :str = os.path.join('artifacts' , 'test')
+    raw_data_path:str = os.path.join('artifacts' , 'data')
+    # "auto" (feather with pyarrow, npz without), "feather" or "npz"
+    artifact_format: str = "auto"
+    # Optional CSV copies of the datasets
+    export_csv: bool = False
+    train_csv_path :str = os.path.join('artifacts' , 'train.cv')
+    test_csv_path :str = os.path.join('artifacts' , 'test.cv')
+    raw_csv_path:str = os.path.join('artifacts' , 'data.cv')
+
+def hash_split_mask(frame, test_size, key_columns=None):
+    """
+    Boolean mask of the rows assigned to the test set. A row's side depends
+    only on the values of its key columns, so the split is the same whatever
+    the chunking or row order. Numbers are hashed as float64, so a column
+    parsed as int in one chunk and float in another still hashes alike;
+    text and categoricals hash by value.
+    """
+    keys = frame[list(key_columns)] if key_columns else frame
+    keys = pd.DataFrame({
+        column: values.astype("float64") if pd.api.types.is_numeric_dtype(values) else values
+        for column, values in keys.items()
+    })
+    buckets = pd.util.hash_pandas_object(keys, index=False).to_numpy() % np.uint64(10000)
+    return buckets < np.uint64(round(test_size * 10000))
+
+
+class _BoundedReader:
+    """
+    File-like view of the next `limit` bytes of an open binary file, so that
+    pandas stops at the watermark even if the source keeps growing.
+    """
+
+    def __init__(self, file_obj, limit):
+        self.file_obj = file_obj
+        self.remaining = limit
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file_obj.read(size)
+        self.remaining -= len(data)
+        return data
+
+
+def _hash_source(path, prefix_size, size, block_size=1 << 20):
+    """
+    sha256 of the first `prefix_size` bytes and of the first `size` bytes of
+    a file, in one pass. The prefix hash is None when the file is shorter.
+    """
+    digest, prefix_hash, position = hashlib.sha256(), None, 0
+    with open(path, "rb") as file_obj:
+        for stop in (min(prefix_size, size), size):
+            while position < stop:
+                block = file_obj.read(min(block_size, stop - position))
+                if not block:
+                    break
+                digest.update(block)
+                position += len(block)
+            if stop == prefix_size == position and prefix_hash is None:
+                prefix_hash = digest.hexdigest()
+    return prefix_hash, digest.hexdigest()
+
+
+def _ingest_shard(config, shard_index, source, dataset_paths):
+    """
+    Worker task: splits one CSV shard chunk by chunk into parts named
+    `<shard>-<chunk>`, so shards never write the same file.
+    """
+    ingestion = DataIngestion(replace(config, export_csv=False))
+    reader = STUDENT_SCHEMA.read_csv(source, chunksize=config.chunk_size)
+    rows, _ = ingestion._append_chunks(reader, dataset_paths, part_prefix=f"{shard_index:05d}-")
+    logging.info(f"Ingested shard {source}: {rows}")
+    return rows
+
 
 class DataIngestion:
     """
     Class responsible for data ingestion tasks, including:
-     - Reading data from CSV
+     - Reading data from a CSV or SQLite source
      - Creating directories for output data (if needed)
      - Splitting data into training and testing sets
-     - Saving split data to CSV files
+     - Saving split data as columnar datasets (CSV export optional)
     """
 
     def __init__(self, config: DataIngestionConfig = None):
@@ -35,7 +133,7 @@ class DataIngestion:
             config (DataIngestionConfig, optional): Configuration object for data paths.
                 Defaults to None, using default paths defined in the class.
         """
-        self.config = DataIngestionConfig()  # Use provided config or defaults
+        self.config = config or DataIngestionConfig()  # Use provided config or defaults
 
     def initiate_data_ingestion(self):
         """
@@ -47,23 +145,45 @@ class DataIngestion:
         logging.info("Entered the data ingestion method")
 
         try:
-            # Read data from CSV
-            df = pd.read_csv('data/stud.csv')
+            if self.config.source_type not in SOURCE_TYPES:
+                raise ValueError(f"Unknown source type {self.config.source_type!r}, expected one of {SOURCE_TYPES}")
+            if self.config.source_type != "csv" and self.config.ingestion_mode == "incremental":
+                raise ValueError("Incremental ingestion needs a CSV source file")
+            if self.config.source_type == "csv" and is_sharded_source(self.config.source_data_path):
+                if self.config.ingestion_mode == "incremental":
+                    raise ValueError("Incremental ingestion needs a single source file, not a directory or glob")
+                return self.initiate_sharded_ingestion()
+            if self.config.ingestion_mode == "streaming":
+                return self.initiate_streaming_ingestion()
+            if self.config.ingestion_mode == "incremental":
+                return self.initiate_incremental_ingestion()
+            if self.config.ingestion_mode != "in_memory":
+                raise ValueError(f"Unknown ingestion mode {self.config.ingestion_mode!r}")
+
+            # Read data from the source
+            with self.data_source() as source:
+                df = source.read()
             logging.info("Data set successfully loaded as a DataFrame.")
 
             # Create directories for output data (if needed)
             os.makedirs(os.path.dirname(self.config.train_data_path), exist_ok=True)
 
-            df.to_csv(self.config.raw_data_path , index=True, header=True)
+            write_frame(df, self.config.raw_data_path, self.config.artifact_format)
 
             # Split data into training and testing sets
-            train_set, test_set = train_test_split(df, test_size=0.33, random_state=42)
+            train_set, test_set = train_test_split(df, test_size=self.config.test_size, random_state=42)
             logging.info("Train/test split completed.")
 
-            # Save split data to CSV files
-            train_set.to_csv(self.config.train_data_path, index=True, header=True)
-            test_set.to_csv(self.config.test_data_path, index=True, header=True)
-            logging.info("Data saved to training and testing CSV files.")
+            # Save split data as columnar datasets
+            write_frame(train_set, self.config.train_data_path, self.config.artifact_format)
+            write_frame(test_set, self.config.test_data_path, self.config.artifact_format)
+            logging.info("Data saved to training and testing datasets.")
+
+            if self.config.export_csv:
+                df.to_csv(self.config.raw_csv_path, index=True, header=True)
+                train_set.to_csv(self.config.train_csv_path, index=True, header=True)
+                test_set.to_csv(self.config.test_csv_path, index=True, header=True)
+                logging.info("Data exported to CSV files.")
 
             logging.info("Data ingestion completed successfully.")
 
@@ -74,13 +194,223 @@ class DataIngestion:
             logging.info(error_msg)  # Log error messages with a higher severity level (error)
             raise CustomException(error_msg)  # Re-raise the custom exception for clearer error handling
 
-if __name__ == '__main__':
-    data_ingester = DataIngestion()
-    train_data, test_data = data_ingester.initiate_data_ingestion()
+    def data_source(self):
+        """
+        The configured source (src/components/data_sources.py).
+        """
+        if self.config.source_type == "sqlite":
+            return SQLiteSource(self.config.sqlite)
+        return CSVSource(self.config.source_data_path)
+
+    def _outputs(self):
+        return {
+            "raw": (self.config.raw_data_path, self.config.raw_csv_path),
+            "train": (self.config.train_data_path, self.config.train_csv_path),
+            "test": (self.config.test_data_path, self.config.test_csv_path),
+        }
+
+    def _append_chunks(self, reader, dataset_paths, first_part=0, first_row=0, part_prefix=""):
+        """
+        Splits every chunk of `reader` and appends it as one part per dataset,
+        named `part_prefix` followed by the part index.
+
+        Returns:
+            tuple: (rows written per dataset, index of the next part)
+        """
+        outputs = self._outputs()
+        rows = {name: 0 for name in outputs}
+        part_index = first_part
+        for chunk in reader:
+            chunk.index = pd.RangeIndex(first_row + rows["raw"], first_row + rows["raw"] + len(chunk))
+            test_mask = hash_split_mask(chunk, self.config.test_size, self.config.split_key_columns)
+            parts = {"raw": chunk, "train": chunk[~test_mask], "test": chunk[test_mask]}
+            for name, part in parts.items():
+                if part.empty:
+                    continue
+                write_part(part, dataset_paths[name], f"{part_prefix}{part_index:05d}", self.config.artifact_format)
+                if self.config.export_csv:
+                    csv_path = outputs[name][1]
+                    part.to_csv(csv_path, mode="a", index=True, header=not os.path.exists(csv_path))
+                rows[name] += len(part)
+            logging.info(f"Ingested chunk {part_index} ({len(chunk)} rows)")
+            part_index += 1
+        return rows, part_index
 
-    data_transformation = DataTransformation()
-    
-    transformed_train_data, transformed_test_data , pkl_1 = data_transformation.initiate_data_transformation(train_data , test_data)
+    def _start_build(self):
+        """
+        Empty temporary dataset directories (and CSV exports) to build into.
+        """
+        outputs = self._outputs()
+        building = {name: f"{dataset_path}.tmp" for name, (dataset_path, _) in outputs.items()}
+        for tmp_path in building.values():
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        if self.config.export_csv:
+            for _, csv_path in outputs.values():
+                if os.path.exists(csv_path):
+                    os.remove(csv_path)
+        return building
+
+    def _finish_build(self, building, rows):
+        if not rows["raw"]:
+            raise ValueError(f"No rows in the {self.config.source_type} source")
+        for name, (dataset_path, _) in self._outputs().items():
+            os.makedirs(building[name], exist_ok=True)
+            replace_dataset(building[name], dataset_path)
+
+    def _rebuild(self, reader):
+        """
+        Splits every chunk of `reader` into fresh datasets built in temporary
+        directories and swapped in at the end.
+        """
+        building = self._start_build()
+        rows, next_part = self._append_chunks(reader, building)
+        self._finish_build(building, rows)
+        return rows, next_part
+
+    def initiate_streaming_ingestion(self):
+        """
+        Out-of-core ingestion: reads the source `chunk_size` rows at a time,
+        splits every chunk with `hash_split_mask` and appends it as one part to
+        the raw/train/test datasets, so only one chunk is in memory.
+        """
+        with self.data_source() as source:
+            rows, _ = self._rebuild(source.chunks(self.config.chunk_size))
+        logging.info(f"Streaming ingestion completed: {rows}")
+        return self.config.train_data_path, self.config.test_data_path
+
+    def initiate_sharded_ingestion(self):
+        """
+        Ingests a directory or glob of CSV shards. Shards are parsed with the
+        schema dtypes in `n_jobs` worker processes; each worker splits its
+        shard chunk by chunk with `hash_split_mask` and writes its own parts
+        into the datasets, so no process ever holds more than one chunk and
+        the split matches streaming ingestion of the concatenated shards.
+        CSV exports are appended from the finished parts, numbered by row
+        position within each dataset.
+        """
+        sources = list_source_files(self.config.source_data_path)
+        if not sources:
+            raise FileNotFoundError(f"No CSV shards match {self.config.source_data_path}")
+        n_jobs = self.config.n_jobs
+        if n_jobs is not None and n_jobs < 0:
+            n_jobs = os.cpu_count()
+        n_jobs = max(1, min(n_jobs or 1, len(sources)))
+
+        building = self._start_build()
+        config = self.config
+        if n_jobs == 1:
+            shard_rows = [_ingest_shard(config, i, source, building) for i, source in enumerate(sources)]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                shard_rows = list(executor.map(_ingest_shard, [config] * len(sources), range(len(sources)),
+                                               sources, [building] * len(sources)))
+        rows = {name: sum(counts[name] for counts in shard_rows) for name in building}
+
+        if self.config.export_csv:
+            for name, (_, csv_path) in self._outputs().items():
+                written = 0
+                for part in iter_frames(building[name]):
+                    part.index = pd.RangeIndex(written, written + len(part))
+                    part.to_csv(csv_path, mode="a", index=True, header=not written)
+                    written += len(part)
+        self._finish_build(building, rows)
+        logging.info(f"Sharded ingestion of {len(sources)} files on {n_jobs} workers completed: {rows}")
+        return self.config.train_data_path, self.config.test_data_path
+
+    def _split_settings(self):
+        # Appending is only valid while rows keep landing on the same side and format.
+        return {
+            "source_data_path": self.config.source_data_path,
+            "test_size": self.config.test_size,
+            "split_key_columns": list(self.config.split_key_columns or []),
+            "artifact_format": resolve_format(self.config.artifact_format),
+            "export_csv": self.config.export_csv,
+        }
+
+    def _load_ingestion_state(self):
+        if not os.path.exists(self.config.ingestion_state_path):
+            return None
+        with open(self.config.ingestion_state_path) as file_obj:
+            return json.load(file_obj)
+
+    def _save_ingestion_state(self, state):
+        tmp_path = f"{self.config.ingestion_state_path}.tmp"
+        with open(tmp_path, "w") as file_obj:
+            json.dump(state, file_obj, indent=2)
+        os.replace(tmp_path, self.config.ingestion_state_path)
+
+    def _full_rebuild_reason(self, state, size, prefix_hash):
+        if state is None:
+            return "no watermark recorded"
+        if state["settings"] != self._split_settings():
+            return "split settings changed"
+        if size < state["byte_offset"] or prefix_hash != state["prefix_sha256"]:
+            return "previously ingested content changed"
+        if not state["ends_with_newline"] and size > state["byte_offset"]:
+            return "the last ingested row was extended"
+        if not all(os.path.isdir(dataset_path) for dataset_path, _ in self._outputs().values()):
+            return "datasets are missing"
+        return None
+
+    def initiate_incremental_ingestion(self):
+        """
+        Watermark-based ingestion. The byte offset and sha256 of the source
+        content already split are kept in `ingestion_state_path`; when the
+        file still starts with exactly that content, only the bytes after the
+        offset are parsed and appended as new parts. Otherwise (first run,
+        edited or truncated source, changed split settings) the datasets are
+        rebuilt like the streaming mode.
+        """
+        source = self.config.source_data_path
+        size = os.path.getsize(source)
+        state = self._load_ingestion_state()
+        offset = state["byte_offset"] if state else 0
+        prefix_hash, content_hash = _hash_source(source, offset, size)
+        rebuild_reason = self._full_rebuild_reason(state, size, prefix_hash)
+
+        with open(source, "rb") as file_obj:
+            if rebuild_reason is None and size == offset:
+                logging.info("No rows appended since the last ingestion.")
+                return self.config.train_data_path, self.config.test_data_path
+
+            if rebuild_reason is None:
+                # Parts past the recorded ones come from a run that died before saving its state.
+                for dataset_path, _ in self._outputs().values():
+                    for path in list_parts(dataset_path):
+                        part_index = int(os.path.basename(path)[len("part-"):].split(".")[0])
+                        if part_index >= state["next_part"]:
+                            os.remove(path)
+                file_obj.seek(offset)
+                reader = STUDENT_SCHEMA.read_csv(_BoundedReader(file_obj, size - offset), header=None,
+                                                 names=state["columns"], chunksize=self.config.chunk_size)
+                dataset_paths = {name: dataset_path for name, (dataset_path, _) in self._outputs().items()}
+                appended, next_part = self._append_chunks(reader, dataset_paths, state["next_part"],
+                                                          state["rows"]["raw"])
+                rows = {name: state["rows"][name] + count for name, count in appended.items()}
+                logging.info(f"Incremental ingestion appended {appended} after byte {offset}")
+            else:
+                logging.info(f"Full ingestion rebuild: {rebuild_reason}")
+                columns = STUDENT_SCHEMA.read_csv(source, nrows=0).columns.tolist()
+                rows, next_part = self._rebuild(STUDENT_SCHEMA.read_csv(_BoundedReader(file_obj, size),
+                                                                         chunksize=self.config.chunk_size))
+
+            file_obj.seek(size - 1)
+            ends_with_newline = file_obj.read(1) in (b"\n", b"\r")
+
+        self._save_ingestion_state({
+            "settings": self._split_settings(),
+            "columns": state["columns"] if rebuild_reason is None else columns,
+            "byte_offset": size,
+            "prefix_sha256": content_hash,
+            "ends_with_newline": ends_with_newline,
+            "next_part": next_part,
+            "rows": rows,
+        })
+        return self.config.train_data_path, self.config.test_data_path
+
+if __name__ == '__main__':
+    # The stages (ingestion -> transformation -> training -> prediction table)
+    # are orchestrated by the incremental training pipeline.
+    from src.pipeline.train_pipeline import main
 
-    ModelTrainer = ModelTrainer()
-    print(ModelTrainer.initiate_model_trainer(transformed_train_data, transformed_test_data))
\ No newline at end of file
+    main()
@@ -0,0 +1,153 @@
+"""
+Data sources DataIngestion reads the student records from.
+
+A source yields the records as DataFrames with the schema dtypes
+(src/schema.py), either whole (`read`) or `chunk_size` rows at a time
+(`chunks`) for the chunked hash split, and lists the files its content
+comes from (`files`) so the training pipeline can fingerprint them.
+
+    CSVSource     a CSV file, or a directory / glob of CSV shards
+    SQLiteSource  a table of a local SQLite database
+"""
+
+import glob
+import os
+import sqlite3
+from dataclasses import dataclass
+
+import pandas as pd
+
+from src.logger import logging
+from src.schema import STUDENT_SCHEMA
+
+SOURCE_TYPES = ("csv", "sqlite")
+
+
+@dataclass
+class SQLiteSourceConfig:
+    database_path: str = os.path.join("data", "students.db")
+    table: str = "students"
+    # Columns selected in SQL (None: the schema columns)
+    columns: tuple = None
+    # Optional SQL condition pushed into the query, with "?" placeholders bound to `params`
+    where: str = None
+    params: tuple = ()
+
+
+def is_sharded_source(path):
+    """
+    True when the source is a directory or glob of CSV shards.
+    """
+    return os.path.isdir(path) or glob.has_magic(path)
+
+
+def list_source_files(path):
+    """
+    The CSV files behind a source path in ingestion order: the `*.csv` files
+    of a directory, the sorted matches of a glob, or the path itself.
+    """
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".csv"))
+    if glob.has_magic(path):
+        return sorted(match for match in glob.glob(path) if os.path.isfile(match))
+    return [path]
+
+
+def _concat(frames):
+    # Chunks with different category sets concatenate to plain values; the cast restores them.
+    return frames[0] if len(frames) == 1 else STUDENT_SCHEMA.cast(pd.concat(frames, ignore_index=True))
+
+
+class CSVSource:
+    def __init__(self, path, columns=None):
+        self.path = path
+        self.columns = list(columns) if columns else None
+
+    def files(self):
+        return list_source_files(self.path)
+
+    def read(self):
+        frames = [STUDENT_SCHEMA.read_csv(path, columns=self.columns) for path in self.files()]
+        return _concat(frames)
+
+    def chunks(self, chunk_size):
+        for path in self.files():
+            yield from STUDENT_SCHEMA.read_csv(path, columns=self.columns, chunksize=chunk_size)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class SQLiteSource:
+    """
+    Reads a table of a local SQLite database without going through CSV.
+
+    The query selects only the configured columns and applies the `where`
+    condition in SQL, so projected-out columns and filtered-out rows never
+    leave SQLite. Rows are pulled with `fetchmany` in batches of the chunk
+    size, each batch becoming one DataFrame chunk. The read-only connection
+    is opened on first use and reused by every later query until `close`.
+    """
+
+    def __init__(self, config: SQLiteSourceConfig = None):
+        self.config = config or SQLiteSourceConfig()
+        self._connection = None
+
+    def connection(self):
+        if self._connection is None:
+            if not os.path.exists(self.config.database_path):
+                raise FileNotFoundError(f"No SQLite database at {self.config.database_path}")
+            uri = f"file:{os.path.abspath(self.config.database_path)}?mode=ro"
+            self._connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def files(self):
+        return [self.config.database_path]
+
+    def query(self):
+        columns = list(self.config.columns or STUDENT_SCHEMA.names)
+        sql = f"SELECT {', '.join(map(_quote, columns))} FROM {_quote(self.config.table)}"
+        if self.config.where:
+            sql += f" WHERE {self.config.where}"
+        return sql, columns
+
+    def chunks(self, chunk_size):
+        sql, columns = self.query()
+        cursor = self.connection().execute(sql, tuple(self.config.params))
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield STUDENT_SCHEMA.cast(pd.DataFrame.from_records(rows, columns=columns))
+        finally:
+            cursor.close()
+
+    def read(self, chunk_size=100000):
+        frames = list(self.chunks(chunk_size))
+        if not frames:
+            _, columns = self.query()
+            return STUDENT_SCHEMA.cast(pd.DataFrame(columns=columns))
+        logging.info(f"Read {sum(map(len, frames))} rows from {self.config.database_path}:{self.config.table}")
+        return _concat(frames)
@@ -3,14 +3,15 @@ import os
 from dataclasses import dataclass
 
 import numpy as np
-import pandas as pd
 from sklearn.compose import ColumnTransformer
 from sklearn.impute import SimpleImputer
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
+from src.components.frame_store import read_table
 from src.exception import CustomException
 from src.logger import logging
+from src.schema import STUDENT_SCHEMA
 from src.utils import save_object
 
 @dataclass
@@ -24,9 +25,8 @@ class DataTransformation:
 
     def get_transformer_object(self):
         try:
-            numerical_features = ['reading_score', 'writing_score']
-            categorical_features = ['gender', 'race_ethnicity', 'parental_level_of_education',
-                                     'lunch', 'test_preparation_course']
+            numerical_features = STUDENT_SCHEMA.numerical_columns
+            categorical_features = STUDENT_SCHEMA.categorical_columns
 
             num_pipeline = Pipeline(
                 steps=[
@@ -59,16 +59,18 @@ class DataTransformation:
 
     def initiate_data_transformation(self, train_data_path, test_data_path):
         try:
-            train_df = pd.read_csv(train_data_path)
-            test_df = pd.read_csv(test_data_path)
+            train_df = read_table(train_data_path, schema=STUDENT_SCHEMA)
+            test_df = read_table(test_data_path, schema=STUDENT_SCHEMA)
             logging.info("Read train and test data completed.")
             logging.info("Obtaining preprocessing object.")
 
             preprocessor_obj = self.get_transformer_object()
-            target_column = "math_score"
+            target_column = STUDENT_SCHEMA.target_column
+            feature_columns = STUDENT_SCHEMA.feature_columns
 
-            train_features = train_df.drop(columns=[target_column], axis=1)
-            test_features = test_df.drop(columns=[target_column], axis=1)
+            # Scores are stored as float32; the preprocessor is fitted on float64.
+            train_features = STUDENT_SCHEMA.cast(train_df[feature_columns], model_input=True)
+            test_features = STUDENT_SCHEMA.cast(test_df[feature_columns], model_input=True)
 
             train_target = train_df[target_column]
             test_target = test_df[target_column]
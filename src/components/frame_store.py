@@ -0,0 +1,176 @@
+"""
+Columnar storage for the intermediate DataFrames (raw, train and test data).
+
+A dataset is a directory of part files read back in name order. Parts are
+Arrow/Feather files when pyarrow is installed and .npz archives otherwise;
+both keep the column dtypes, categoricals included, so reading a dataset
+back needs no parsing or type inference. CSV stays available as an export.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+FORMATS = ("feather", "npz")
+_EXTENSIONS = {"feather": ".feather", "npz": ".npz"}
+
+
+def resolve_format(format="auto"):
+    if format == "auto":
+        return "feather" if HAS_PYARROW else "npz"
+    if format not in FORMATS:
+        raise ValueError(f"Unknown frame format {format!r}, expected 'auto' or one of {FORMATS}")
+    if format == "feather" and not HAS_PYARROW:
+        raise ImportError("The feather format needs pyarrow")
+    return format
+
+
+def _write_npz(frame, path):
+    arrays, columns = {}, []
+    for i, (column, series) in enumerate(frame.items()):
+        key = f"c{i}"
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories
+            arrays[f"{key}_codes"] = series.cat.codes.to_numpy()
+            arrays[f"{key}_categories"] = (np.asarray(categories, dtype=str)
+                                            if pd.api.types.is_string_dtype(categories) else categories.to_numpy())
+            columns.append({"name": column, "kind": "category", "ordered": bool(series.cat.ordered)})
+        elif pd.api.types.is_string_dtype(series.dtype) or series.dtype == object:
+            # Strings are stored dictionary-encoded too; missing values get code -1.
+            codes, uniques = pd.factorize(series)
+            arrays[f"{key}_codes"] = codes
+            arrays[f"{key}_categories"] = np.asarray(uniques, dtype=str)
+            columns.append({"name": column, "kind": "string", "dtype": str(series.dtype)})
+        else:
+            arrays[f"{key}_values"] = series.to_numpy()
+            columns.append({"name": column, "kind": "values"})
+    arrays["meta"] = np.array(json.dumps({"columns": columns}))
+    with open(path, "wb") as file_obj:
+        np.savez(file_obj, **arrays)
+
+
+def _read_npz(path, columns=None):
+    with np.load(path, allow_pickle=False) as archive:
+        meta = json.loads(str(archive["meta"]))
+        data = {}
+        for i, column in enumerate(meta["columns"]):
+            name = column["name"]
+            if columns is not None and name not in columns:
+                continue
+            key = f"c{i}"
+            if column["kind"] == "values":
+                data[name] = archive[f"{key}_values"]
+                continue
+            codes, categories = archive[f"{key}_codes"], archive[f"{key}_categories"]
+            if column["kind"] == "category":
+                data[name] = pd.Categorical.from_codes(codes, categories=categories, ordered=column["ordered"])
+            else:
+                values = pd.Series(categories[np.maximum(codes, 0)], dtype=column["dtype"])
+                data[name] = values.mask(codes < 0)
+    frame = pd.DataFrame(data)
+    return frame[[name for name in columns if name in frame]] if columns is not None else frame
+
+
+def list_parts(dataset_path):
+    """
+    Part files of a dataset in read order (empty when it does not exist).
+    """
+    if not os.path.isdir(dataset_path):
+        return []
+    return [os.path.join(dataset_path, name) for name in sorted(os.listdir(dataset_path))
+            if name.startswith("part-") and os.path.splitext(name)[1] in _EXTENSIONS.values()]
+
+
+def write_part(frame, dataset_path, part_name, format="auto"):
+    """
+    Writes one part into a dataset directory (atomically) and returns its path.
+    """
+    format = resolve_format(format)
+    os.makedirs(dataset_path, exist_ok=True)
+    path = os.path.join(dataset_path, f"part-{part_name}{_EXTENSIONS[format]}")
+    tmp_path = f"{path}.tmp"
+    frame = frame.reset_index(drop=True)
+    if format == "feather":
+        frame.to_feather(tmp_path)
+    else:
+        _write_npz(frame, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_frame(frame, dataset_path, format="auto"):
+    """
+    Replaces a dataset with a single-part dataset holding `frame`. The new
+    directory is built next to the old one and swapped in at the end.
+    """
+    tmp_path = f"{dataset_path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    write_part(frame, tmp_path, "00000", format)
+    replace_dataset(tmp_path, dataset_path)
+    return dataset_path
+
+
+def replace_dataset(source_path, dataset_path):
+    old_path = f"{dataset_path}.old"
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(dataset_path):
+        os.replace(dataset_path, old_path)
+    os.replace(source_path, dataset_path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def _read_part(path, columns=None):
+    if path.endswith(_EXTENSIONS["feather"]):
+        return pd.read_feather(path, columns=columns)
+    return _read_npz(path, columns)
+
+
+def iter_frames(dataset_path, columns=None):
+    """
+    Yields the parts of a dataset one DataFrame at a time, in read order.
+    """
+    for path in list_parts(dataset_path):
+        yield _read_part(path, columns)
+
+
+def read_frame(dataset_path, columns=None):
+    """
+    Reads every part of a dataset into one DataFrame with its stored dtypes.
+    """
+    frames = list(iter_frames(dataset_path, columns))
+    if not frames:
+        raise FileNotFoundError(f"No dataset parts in {dataset_path}")
+    if len(frames) == 1:
+        return frames[0]
+    frame = pd.concat(frames, ignore_index=True)
+    # Parts with different category sets concatenate to plain values; restore the dtype.
+    for column, dtype in frames[0].dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype) and not isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype("category")
+    return frame
+
+
+def read_table(path, columns=None, schema=None):
+    """
+    Reads a dataset directory, or a CSV export written with its index. With a
+    `schema` (src/schema.py) the CSV is parsed with its dtypes and a dataset
+    is cast to them.
+    """
+    if os.path.isdir(path):
+        frame = read_frame(path, columns)
+        return schema.cast(frame) if schema is not None else frame
+    if schema is not None:
+        frame = schema.read_csv(path, index_col=0)
+    else:
+        frame = pd.read_csv(path, index_col=0)
+    return frame[columns] if columns is not None else frame
@@ -0,0 +1,403 @@
+import itertools
+import json
+import math
+import os
+import socket
+import sqlite3
+import sys
+import time
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import artifacts_version, evaluate_models
+
+
+@dataclass
+class HyperparameterSearchConfig:
+    # New trials per model family and run (0 disables the search)
+    trials: int = 0
+    # "random", "grid" or "model" (random start, then a surrogate model proposes)
+    sampler: str = "random"
+    # Worker processes fitting trials concurrently
+    n_jobs: int = 1
+    storage_path: str = os.path.join("artifacts", "trials.db")
+    study_name: str = "model_trainer"
+    # Salted with the worker id, so concurrent workers on one study draw different trials
+    random_state: int = 42
+    # Share of the training rows held out to score the trials; they are never
+    # fitted on or used for early stopping
+    eval_fraction: float = 0.1
+    # Points per numeric range in grid search
+    grid_size: int = 3
+    # Model-based sampler: random trials before the surrogate is used, and
+    # random candidates it ranks per suggestion
+    startup_trials: int = 5
+    candidates_per_suggestion: int = 64
+    # A trial still "running" after this long is assumed lost and may be re-run
+    stale_after_seconds: float = 3600.0
+
+
+@dataclass(frozen=True)
+class IntRange:
+    low: int
+    high: int
+    log: bool = False
+
+
+@dataclass(frozen=True)
+class FloatRange:
+    low: float
+    high: float
+    log: bool = False
+
+
+# Per-family search spaces, keyed by the ModelTrainer candidate names. A list
+# is a set of choices; families without a space keep their defaults.
+SEARCH_SPACES = {
+    'Random Forest': {
+        "n_estimators": IntRange(50, 400, log=True),
+        "max_depth": [None, 8, 16, 32],
+        "min_samples_leaf": IntRange(1, 10),
+        "max_features": [1.0, 0.5, "sqrt"],
+    },
+    'Decision Tree': {
+        "max_depth": [None, 4, 8, 16],
+        "min_samples_leaf": IntRange(1, 20),
+        "max_features": [1.0, 0.5],
+    },
+    'Gradient Boosting': {
+        "learning_rate": FloatRange(0.01, 0.3, log=True),
+        "max_depth": IntRange(2, 6),
+        "subsample": FloatRange(0.5, 1.0),
+        "n_estimators": IntRange(50, 400, log=True),
+    },
+    'KN Classifer': {
+        "n_neighbors": IntRange(3, 50, log=True),
+        "weights": ["uniform", "distance"],
+        "p": [1, 2],
+    },
+    'xgboost': {
+        "learning_rate": FloatRange(0.01, 0.3, log=True),
+        "max_depth": IntRange(2, 8),
+        "subsample": FloatRange(0.5, 1.0),
+        "colsample_bytree": FloatRange(0.5, 1.0),
+        "n_estimators": IntRange(50, 500, log=True),
+        "reg_lambda": FloatRange(1e-3, 10.0, log=True),
+    },
+    'CatBossting Classifer': {
+        "depth": IntRange(4, 8),
+        "learning_rate": FloatRange(0.01, 0.3, log=True),
+        "l2_leaf_reg": FloatRange(1.0, 10.0, log=True),
+        "iterations": IntRange(100, 1000, log=True),
+    },
+    'AdaBoost Classifer': {
+        "n_estimators": IntRange(25, 200, log=True),
+        "learning_rate": FloatRange(0.01, 1.0, log=True),
+        "loss": ["linear", "square", "exponential"],
+    },
+}
+
+
+def _canonical(params):
+    """
+    Stable JSON for a parameter set; floats are rounded so that equal
+    suggestions map to the same trial.
+    """
+    params = {key: float(f"{value:.6g}") if isinstance(value, float) else value
+              for key, value in params.items()}
+    return json.dumps(params, sort_keys=True)
+
+
+class TrialStore:
+    """
+    SQLite record of hyperparameter trials, shared by every process using the
+    same file.
+
+    A trial is unique per (study, data fingerprint, family, params): workers
+    claim a parameter set with an INSERT before fitting it, so concurrent runs
+    never evaluate the same set twice and a later run on the same data skips
+    everything already done.
+    """
+
+    def __init__(self, path, stale_after_seconds=3600.0):
+        self.path = path
+        self.stale_after_seconds = stale_after_seconds
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS trials (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                study TEXT NOT NULL,
+                data_fingerprint TEXT NOT NULL,
+                family TEXT NOT NULL,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                score REAL,
+                fit_seconds REAL,
+                worker TEXT,
+                updated_at REAL NOT NULL,
+                UNIQUE (study, data_fingerprint, family, params)
+            )
+            """
+        )
+
+    def reserve(self, study, fingerprint, family, params):
+        """
+        Claims a parameter set for this worker. Returns False when it was
+        already evaluated or is being evaluated by another worker.
+        """
+        now = time.time()
+        key = (study, fingerprint, family, _canonical(params))
+        inserted = self._connection.execute(
+            "INSERT OR IGNORE INTO trials (study, data_fingerprint, family, params, status, worker, updated_at) "
+            "VALUES (?, ?, ?, ?, 'running', ?, ?)",
+            key + (self.worker, now),
+        ).rowcount
+        if inserted:
+            return True
+        # Take over a claim whose worker died without finishing it.
+        return bool(self._connection.execute(
+            "UPDATE trials SET worker = ?, updated_at = ? WHERE study = ? AND data_fingerprint = ? "
+            "AND family = ? AND params = ? AND status = 'running' AND updated_at < ?",
+            (self.worker, now) + key + (now - self.stale_after_seconds,),
+        ).rowcount)
+
+    def finish(self, study, fingerprint, family, params, score=None, fit_seconds=None):
+        """
+        Stores the result of a reserved trial; a None score marks it failed.
+        """
+        self._connection.execute(
+            "UPDATE trials SET status = ?, score = ?, fit_seconds = ?, updated_at = ? "
+            "WHERE study = ? AND data_fingerprint = ? AND family = ? AND params = ?",
+            ("complete" if score is not None else "failed", score, fit_seconds, time.time(),
+             study, fingerprint, family, _canonical(params)),
+        )
+
+    def history(self, study, fingerprint, family):
+        """
+        Completed trials of a family as a list of (params, score).
+        """
+        rows = self._connection.execute(
+            "SELECT params, score FROM trials WHERE study = ? AND data_fingerprint = ? AND family = ? "
+            "AND status = 'complete' ORDER BY id",
+            (study, fingerprint, family),
+        ).fetchall()
+        return [(json.loads(params), score) for params, score in rows]
+
+    def close(self):
+        self._connection.close()
+
+
+class RandomSampler:
+    def __init__(self, space, rng, config: HyperparameterSearchConfig):
+        self.space = space
+        self.rng = rng
+        self.config = config
+
+    def _draw(self, spec):
+        if isinstance(spec, list):
+            return spec[self.rng.integers(len(spec))]
+        low, high = (math.log(spec.low), math.log(spec.high)) if spec.log else (spec.low, spec.high)
+        value = self.rng.uniform(low, high)
+        value = math.exp(value) if spec.log else value
+        return int(round(value)) if isinstance(spec, IntRange) else float(value)
+
+    def suggest(self, history, seen=frozenset()):
+        return {name: self._draw(spec) for name, spec in self.space.items()}
+
+
+class GridSampler:
+    """
+    Walks the grid in a fixed order; numeric ranges contribute `grid_size`
+    evenly (or log-evenly) spaced points. Points in `seen` (the trials already
+    in the store) are skipped here rather than returned, so repeated runs
+    continue where the last stopped until the whole grid is evaluated.
+    """
+
+    def __init__(self, space, rng, config: HyperparameterSearchConfig):
+        axes = [self._points(spec, config.grid_size) for spec in space.values()]
+        self._names = list(space)
+        self._grid = itertools.product(*axes)
+
+    @staticmethod
+    def _points(spec, size):
+        if isinstance(spec, list):
+            return spec
+        points = np.geomspace(spec.low, spec.high, size) if spec.log else np.linspace(spec.low, spec.high, size)
+        if isinstance(spec, IntRange):
+            return sorted({int(round(point)) for point in points})
+        return [float(point) for point in points]
+
+    def suggest(self, history, seen=frozenset()):
+        for values in self._grid:
+            params = dict(zip(self._names, values))
+            if _canonical(params) not in seen:
+                return params
+        return None
+
+
+class ModelBasedSampler(RandomSampler):
+    """
+    Random search until `startup_trials` results exist, then a random forest
+    surrogate fitted on (params -> score) ranks random candidates and the one
+    with the best optimistic estimate (mean + std across trees) is proposed.
+    """
+
+    def _encode(self, params):
+        row = []
+        for name, spec in self.space.items():
+            value = params[name]
+            if isinstance(spec, list):
+                row.append(float(spec.index(value)) if value in spec else -1.0)
+            else:
+                row.append(math.log(value) if spec.log else float(value))
+        return row
+
+    def suggest(self, history, seen=frozenset()):
+        if len(history) < self.config.startup_trials:
+            return super().suggest(history)
+
+        X = np.array([self._encode(params) for params, _ in history])
+        y = np.array([score for _, score in history])
+        surrogate = RandomForestRegressor(n_estimators=50, min_samples_leaf=2, n_jobs=1,
+                                          random_state=int(self.rng.integers(2 ** 31)))
+        surrogate.fit(X, y)
+
+        candidates = [RandomSampler.suggest(self, history) for _ in range(self.config.candidates_per_suggestion)]
+        encoded = np.array([self._encode(params) for params in candidates])
+        per_tree = np.stack([tree.predict(encoded) for tree in surrogate.estimators_])
+        return candidates[int(np.argmax(per_tree.mean(axis=0) + per_tree.std(axis=0)))]
+
+
+SAMPLERS = {"random": RandomSampler, "grid": GridSampler, "model": ModelBasedSampler}
+
+
+class HyperparameterSearch:
+    """
+    Tunes the ModelTrainer candidates family by family.
+
+    Each round the sampler proposes parameter sets, they are claimed in the
+    trial store and fitted together through `evaluate_models` (worker
+    processes and thread budget included), and the scores are written back.
+    The best stored parameters of every family, from this run or an earlier
+    one on the same data, are returned.
+    """
+
+    def __init__(self, config: HyperparameterSearchConfig = None):
+        self.config = config or HyperparameterSearchConfig()
+        if self.config.sampler not in SAMPLERS:
+            raise ValueError(f"Unknown sampler {self.config.sampler!r}, expected one of {list(SAMPLERS)}")
+
+    @staticmethod
+    def data_fingerprint(*arrays):
+        payloads = []
+        for array in arrays:
+            array = np.ascontiguousarray(array)
+            payloads.append(f"{array.shape}{array.dtype.str}".encode())
+            payloads.append(array.tobytes())
+        return artifacts_version(*payloads)
+
+    def _propose(self, sampler, history, count, seen):
+        proposals = []
+        # Bounded so that random draws in a fully explored space end the search; the
+        # grid sampler never returns a seen point, so every draw of it counts.
+        for _ in range(count * 20):
+            if len(proposals) == count:
+                break
+            params = sampler.suggest(history, seen)
+            if params is None:
+                break
+            key = _canonical(params)
+            if key not in seen:
+                seen.add(key)
+                proposals.append(params)
+        return proposals
+
+    def run(self, models, X_train, y_train, X_eval, y_eval, fit_params=None, thread_budget=None):
+        """
+        Args:
+            models (dict): Name -> unfitted estimator; families without a
+                search space are left alone.
+            X_eval, y_eval: Rows the trials are scored on (R2).
+            fit_params (dict, optional): Name -> extra fit arguments, as for
+                evaluate_models.
+
+        Returns:
+            dict: Name -> best parameters found for that family.
+        """
+        try:
+            config = self.config
+            fit_params = fit_params or {}
+            fingerprint = self.data_fingerprint(X_train, y_train, X_eval, y_eval)
+            store = TrialStore(config.storage_path, config.stale_after_seconds)
+            rng = np.random.default_rng([config.random_state, zlib.crc32(store.worker.encode())])
+            best_params = {}
+            try:
+                for family, model in models.items():
+                    space = SEARCH_SPACES.get(family)
+                    if not space:
+                        continue
+                    sampler = SAMPLERS[config.sampler](space, rng, config)
+                    history = store.history(config.study_name, fingerprint, family)
+                    seen = {_canonical(params) for params, _ in history}
+                    evaluated = 0
+
+                    while evaluated < config.trials:
+                        # The model-based sampler learns between rounds of n_jobs trials.
+                        batch = config.n_jobs if config.sampler == "model" else config.trials - evaluated
+                        batch = min(batch, config.trials - evaluated)
+                        # Sets another worker claimed first are skipped; keep drawing until
+                        # the batch is full or the sampler runs out of new sets.
+                        proposals = []
+                        while len(proposals) < batch:
+                            drawn = self._propose(sampler, history, batch - len(proposals), seen)
+                            if not drawn:
+                                break
+                            proposals += [params for params in drawn
+                                          if store.reserve(config.study_name, fingerprint, family, params)]
+                        if not proposals:
+                            break
+
+                        trials = {f"{family} #{i}": clone(model).set_params(**params)
+                                  for i, params in enumerate(proposals)}
+                        details = {}
+                        try:
+                            report = evaluate_models(X_train=X_train, y_train=y_train, X_test=X_eval, y_test=y_eval,
+                                                     models=trials, n_jobs=config.n_jobs, thread_budget=thread_budget,
+                                                     details=details,
+                                                     fit_params={name: fit_params[family] for name in trials
+                                                                 if family in fit_params})
+                        except Exception:
+                            for params in proposals:
+                                store.finish(config.study_name, fingerprint, family, params)
+                            raise
+
+                        for name, params in zip(trials, proposals):
+                            store.finish(config.study_name, fingerprint, family, params,
+                                         score=float(report[name]), fit_seconds=details[name]["fit_seconds"])
+                        evaluated += len(proposals)
+                        history = store.history(config.study_name, fingerprint, family)
+
+                    if history:
+                        params, score = max(history, key=lambda trial: trial[1])
+                        best_params[family] = params
+                        logging.info(f"Best {family} parameters after {len(history)} trials ({evaluated} new): "
+                                     f"{params} with R2 {score:.4f}")
+            finally:
+                store.close()
+
+            return best_params
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,137 @@
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+import dill
+import numpy as np
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+@dataclass
+class ModelLeaderboardConfig:
+    leaderboard_file_path: str = os.path.join("artifacts", "leaderboard.json")
+    # Selection constraints, None disables a constraint
+    max_p99_single_row_latency_ms: float = None
+    max_artifact_size_mb: float = None
+    max_peak_memory_mb: float = None
+    # Measurement settings
+    single_row_repeats: int = 200
+    batch_size: int = 1000
+    batch_repeats: int = 5
+
+
+class ModelLeaderboard:
+    """
+    Measures every fitted candidate beyond test R2 and picks the production model.
+
+    For each candidate the leaderboard records test R2, fit time, peak fit
+    memory and boosting rounds used (from evaluate_models), single-row
+    predict latency percentiles, batch predict latency and the size of the
+    pickled estimator. `select`
+    returns the best R2 among the candidates that satisfy the configured
+    constraints, and `save` writes the table next to model.pkl.
+    """
+
+    def __init__(self, config: ModelLeaderboardConfig = None):
+        self.config = config or ModelLeaderboardConfig()
+
+    def _single_row_latency(self, model, X):
+        samples = []
+        for i in range(self.config.single_row_repeats):
+            row = X[i % len(X)].reshape(1, -1)
+            started = time.perf_counter()
+            model.predict(row)
+            samples.append((time.perf_counter() - started) * 1000.0)
+        return np.percentile(samples, 50), np.percentile(samples, 99)
+
+    def _batch_latency(self, model, X):
+        batch = np.resize(X, (self.config.batch_size, X.shape[1]))
+        samples = []
+        for _ in range(self.config.batch_repeats):
+            started = time.perf_counter()
+            model.predict(batch)
+            samples.append((time.perf_counter() - started) * 1000.0)
+        return float(np.median(samples))
+
+    def _violations(self, entry):
+        limits = (
+            ("p99_single_row_latency_ms", self.config.max_p99_single_row_latency_ms),
+            ("artifact_size_mb", self.config.max_artifact_size_mb),
+            ("peak_memory_mb", self.config.max_peak_memory_mb),
+        )
+        return [f"{key} {entry[key]:.3f} > {limit}" for key, limit in limits
+                if limit is not None and entry[key] is not None and entry[key] > limit]
+
+    def build(self, models, model_report, details, X_test):
+        """
+        Args:
+            models (dict): Name -> fitted estimator.
+            model_report (dict): Name -> test R2 from evaluate_models.
+            details (dict): Name -> fit details from evaluate_models.
+            X_test (np.ndarray): Rows used for the latency measurements.
+
+        Returns:
+            list[dict]: One entry per candidate, best R2 first.
+        """
+        try:
+            entries = []
+            for name, model in models.items():
+                p50, p99 = self._single_row_latency(model, X_test)
+                batch_ms = self._batch_latency(model, X_test)
+                detail = details.get(name, {})
+                entry = {
+                    "name": name,
+                    "estimator": type(model).__name__,
+                    "r2": float(model_report[name]),
+                    "fit_seconds": detail.get("fit_seconds"),
+                    "peak_memory_mb": detail.get("peak_memory_mb"),
+                    "iterations": detail.get("iterations"),
+                    "train_sample_r2": detail.get("train_sample_r2"),
+                    "overfit_gap": detail.get("overfit_gap"),
+                    "p50_single_row_latency_ms": float(p50),
+                    "p99_single_row_latency_ms": float(p99),
+                    "batch_latency_ms": batch_ms,
+                    "batch_size": self.config.batch_size,
+                    "artifact_size_mb": len(dill.dumps(model)) / 2 ** 20,
+                }
+                entry["violations"] = self._violations(entry)
+                entry["eligible"] = not entry["violations"]
+                entries.append(entry)
+
+            entries.sort(key=lambda entry: entry["r2"], reverse=True)
+            return entries
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def select(self, entries):
+        """
+        Returns the name of the eligible candidate with the highest R2.
+
+        Raises:
+            CustomException: If no candidate satisfies the constraints.
+        """
+        eligible = [entry for entry in entries if entry["eligible"]]
+        if not eligible:
+            raise CustomException("No model satisfies the leaderboard constraints")
+        return max(eligible, key=lambda entry: entry["r2"])["name"]
+
+    def save(self, entries, selected):
+        os.makedirs(os.path.dirname(self.config.leaderboard_file_path), exist_ok=True)
+        leaderboard = {
+            "selected": selected,
+            "constraints": {
+                "max_p99_single_row_latency_ms": self.config.max_p99_single_row_latency_ms,
+                "max_artifact_size_mb": self.config.max_artifact_size_mb,
+                "max_peak_memory_mb": self.config.max_peak_memory_mb,
+            },
+            "candidates": entries,
+        }
+        with open(self.config.leaderboard_file_path, "w") as file_obj:
+            json.dump(leaderboard, file_obj, indent=2)
+        logging.info(f"Leaderboard saved to {self.config.leaderboard_file_path}")
+        return self.config.leaderboard_file_path
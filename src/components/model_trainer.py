@@ -1,7 +1,8 @@
 import os
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+import numpy as np
 from catboost import CatBoostRegressor
 
 from sklearn.ensemble import (
@@ -10,26 +11,118 @@ from sklearn.ensemble import (
     RandomForestRegressor,
 )
 
+from sklearn.base import clone
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import r2_score
+from sklearn.model_selection import train_test_split
 from sklearn.neighbors import KNeighborsRegressor
 from sklearn.tree import DecisionTreeRegressor
 from xgboost import XGBRegressor
 
+from src.components.hyperparameter_search import HyperparameterSearch, HyperparameterSearchConfig
+from src.components.model_leaderboard import ModelLeaderboard, ModelLeaderboardConfig
+from src.components.successive_halving import SuccessiveHalving, SuccessiveHalvingConfig
+from src.components.training_cache import TrainingCache, TrainingCacheConfig
 from src.exception import CustomException
 from src.logger import logging
-from src.utils import evaluate_models
+from src.thread_budget import ThreadBudget, ThreadBudgetConfig
+from src.utils import evaluate_models, iterations_used
 
-from src.utils import save_object
+from src.utils import save_object, write_artifacts_manifest
 
 @dataclass
 class ModelTrainerConfig:
     trained_model_file_path = os.path.join("artifacts" , "model.pkl")
+    preprocessor_file_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    # Written last, with the checksums of the model and the preprocessor it was trained with
+    manifest_file_path: str = os.path.join("artifacts", "manifest.json")
+    # Worker processes used to train the candidates concurrently (1: sequential, -1: all cores)
+    n_jobs: int = 1
+    # Cores shared by the concurrently training candidates and their native thread pools
+    thread_budget: ThreadBudgetConfig = field(default_factory=ThreadBudgetConfig)
+    # "fast" skips train-set inference, "diagnostics" scores a bounded training sample
+    evaluation_mode: str = "fast"
+    diagnostics_sample_size: int = 1000
+    # Share of the training rows held out as the early stopping set for the
+    # boosting candidates (0 disables early stopping)
+    validation_fraction: float = 0.1
+    early_stopping_rounds: int = 20
+    # "full" trains every candidate on all rows, "successive_halving" narrows
+    # the candidates on growing subsamples first
+    selection_mode: str = "full"
+    successive_halving: SuccessiveHalvingConfig = field(default_factory=SuccessiveHalvingConfig)
+    # Fitted candidates reused across runs when data, parameters and library versions are unchanged
+    training_cache: TrainingCacheConfig = field(default_factory=TrainingCacheConfig)
+    # Tunes the candidates before selection when `trials` > 0 (trials kept in artifacts/trials.db)
+    hyperparameter_search: HyperparameterSearchConfig = field(default_factory=HyperparameterSearchConfig)
+    # Latency/size measurements and selection constraints, saved as artifacts/leaderboard.json
+    leaderboard: ModelLeaderboardConfig = field(default_factory=ModelLeaderboardConfig)
     
+class ValidationMonitor:
+    """
+    `monitor` for GradientBoostingRegressor.fit that early-stops on a given
+    validation set, the way xgboost and CatBoost use their eval_set, instead
+    of the estimator carving its own split out of the training rows. Fitting
+    stops once `rounds` stages pass without lowering the squared error on
+    (X_val, y_val).
+    """
+
+    def __init__(self, X_val, y_val, rounds):
+        self.X_val = X_val
+        self.y_val = y_val
+        self.rounds = rounds
+        self._digest = TrainingCache.data_digest(X_val, y_val)
+
+    def __repr__(self):
+        # Stable across processes, so the training cache key does not change between runs.
+        return f"ValidationMonitor(rounds={self.rounds}, data={self._digest})"
+
+    def __call__(self, i, estimator, _locals):
+        if i == 0:
+            init = estimator.init_
+            self._raw = (np.zeros(len(self.y_val)) if isinstance(init, str)
+                         else np.asarray(init.predict(self.X_val), dtype=np.float64).ravel())
+            self._best_loss, self._best_stage = np.inf, 0
+        self._raw = self._raw + estimator.learning_rate * estimator.estimators_[i, 0].predict(self.X_val)
+        loss = float(np.mean((self.y_val - self._raw) ** 2))
+        if loss < self._best_loss:
+            self._best_loss, self._best_stage = loss, i
+        return i - self._best_stage >= self.rounds
+
+    def best_iterations(self, estimator):
+        """
+        Stages of a fitted estimator up to its lowest validation loss, like
+        xgboost's `best_iteration + 1`; `n_estimators_` also counts the
+        `rounds` stages fitted after it. Recomputed from `staged_predict`
+        because the fit may have run on a copy of this monitor in a worker process.
+        """
+        losses = [np.mean((self.y_val - pred) ** 2) for pred in estimator.staged_predict(self.X_val)]
+        return int(np.argmin(losses)) + 1
+
+
+def _refit_params(model, iterations):
+    """
+    Parameters that refit an early-stopped booster for exactly the rounds it
+    kept, without an early stopping set.
+    """
+    if isinstance(model, XGBRegressor):
+        return {"n_estimators": iterations, "early_stopping_rounds": None}
+    if isinstance(model, CatBoostRegressor):
+        return {"iterations": iterations}
+    if isinstance(model, GradientBoostingRegressor):
+        return {"n_estimators": iterations}
+    return {}
+
+
 class ModelTrainer:
     
     def __init__(self) -> None:
         self.model_trainer_config = ModelTrainerConfig()
+        self.thread_utilization = None
+        self.leaderboard = None
+        self.selection_rungs = None
+        self.best_params = None
+        self.training_cache_stats = None
     
     def initiate_model_trainer(self, train_array, test_array):
         try:
@@ -52,27 +145,90 @@ class ModelTrainer:
                 'AdaBoost Classifer': AdaBoostRegressor()
             }
 
-            model_report = evaluate_models(X_train=X_train, y_train=y_train, X_test=X_test, y_test=y_test, models=models)
-
-            # Sort the dict with maximum r2 value.
-            best_model_name = None
-            best_r_squared = -1  # Initialize with a negative value
-
-            for model_name, model_scores in model_report.items():
-                if model_scores > best_r_squared:
-                    best_model_name = model_name
-                    best_r_squared = model_scores
-
-            if best_model_name is None:
-                raise CustomException("No best model found")
+            fit_params = {}
+            X_full, y_full = X_train, y_train
+            validation_fraction = self.model_trainer_config.validation_fraction
+            if validation_fraction:
+                # Carve the early stopping set out of the training rows; every
+                # candidate trains on the remainder so the comparison stays fair,
+                # and the selected model is refitted on all training rows below.
+                X_train, X_val, y_train, y_val = train_test_split(
+                    X_train, y_train, test_size=validation_fraction, random_state=42
+                )
+                rounds = self.model_trainer_config.early_stopping_rounds
+                logging.info(f"Early stopping on {len(X_val)} validation rows after {rounds} rounds without improvement")
+                fit_params['Gradient Boosting'] = {"monitor": ValidationMonitor(X_val, y_val, rounds)}
+                models['xgboost'].set_params(early_stopping_rounds=rounds)
+                fit_params['xgboost'] = {"eval_set": [(X_val, y_val)], "verbose": False}
+                fit_params['CatBossting Classifer'] = {"eval_set": (X_val, y_val),
+                                                       "early_stopping_rounds": rounds}
+
+            thread_budget = ThreadBudget(self.model_trainer_config.thread_budget)
+            search_config = self.model_trainer_config.hyperparameter_search
+            if search_config.trials > 0:
+                # Trials are scored on training rows held out from both their fit and the
+                # early stopping set, keeping the test set for selection.
+                X_search, X_eval, y_search, y_eval = train_test_split(
+                    X_train, y_train, test_size=search_config.eval_fraction, random_state=42
+                )
+                search = HyperparameterSearch(search_config)
+                self.best_params = search.run(models, X_search, y_search, X_eval, y_eval,
+                                              fit_params=fit_params, thread_budget=thread_budget)
+                for name, params in self.best_params.items():
+                    models[name].set_params(**params)
+
+            fit_details = {}
+            evaluate_kwargs = dict(n_jobs=self.model_trainer_config.n_jobs, thread_budget=thread_budget,
+                                   mode=self.model_trainer_config.evaluation_mode,
+                                   diagnostics_sample_size=self.model_trainer_config.diagnostics_sample_size,
+                                   fit_params=fit_params,
+                                   cache=TrainingCache(self.model_trainer_config.training_cache))
+            selection_mode = self.model_trainer_config.selection_mode
+            if selection_mode == "full":
+                model_report = evaluate_models(X_train=X_train, y_train=y_train, X_test=X_test, y_test=y_test,
+                                               models=models, details=fit_details, **evaluate_kwargs)
+            elif selection_mode == "successive_halving":
+                halving = SuccessiveHalving(self.model_trainer_config.successive_halving)
+                model_report, models = halving.run(models, X_train, y_train, X_test, y_test,
+                                                   details=fit_details, **evaluate_kwargs)
+                self.selection_rungs = halving.rungs
+            else:
+                raise ValueError(f"Unknown selection mode {selection_mode!r}")
+            self.thread_utilization = thread_budget.report()
+            self.training_cache_stats = evaluate_kwargs["cache"].stats()
+
+            # Pick the best R2 among the candidates meeting the latency/size constraints.
+            leaderboard = ModelLeaderboard(self.model_trainer_config.leaderboard)
+            self.leaderboard = leaderboard.build(models, model_report, fit_details, X_test)
+            best_model_name = leaderboard.select(self.leaderboard)
+            leaderboard.save(self.leaderboard, best_model_name)
 
             best_model_score = models[best_model_name]
 
             logging.info("Best model is selected and all the algorithms are used")
 
+            if validation_fraction:
+                # Refit the selected model on every training row, boosters for the rounds up
+                # to their best validation score.
+                iterations = iterations_used(best_model_score)
+                monitor = fit_params.get(best_model_name, {}).get("monitor")
+                if monitor is not None:
+                    iterations = monitor.best_iterations(best_model_score)
+                refit = clone(best_model_score).set_params(**_refit_params(best_model_score, iterations))
+                refit_models = {best_model_name: refit}
+                evaluate_models(X_train=X_full, y_train=y_full, X_test=X_test, y_test=y_test,
+                                models=refit_models,
+                                thread_budget=ThreadBudget(self.model_trainer_config.thread_budget),
+                                cache=evaluate_kwargs["cache"])
+                best_model_score = refit_models[best_model_name]
+                logging.info(f"Refitted {best_model_name} on all {len(X_full)} training rows")
+
             try:
                 save_object(file_path=self.model_trainer_config.trained_model_file_path,
                             obj=best_model_score)
+                write_artifacts_manifest(self.model_trainer_config.manifest_file_path,
+                                         model=self.model_trainer_config.trained_model_file_path,
+                                         preprocessor=self.model_trainer_config.preprocessor_file_path)
             except Exception as e:
                 logging.error(f"Error saving the best model: {str(e)}")
 
@@ -0,0 +1,210 @@
+import json
+import math
+import os
+import pickle
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.compiled_preprocessor import fitted_categories
+from src.schema import STUDENT_SCHEMA
+from src.utils import artifacts_version
+
+
+@dataclass
+class PredictionTableConfig:
+    model_file_path: str = os.path.join("artifacts", "model.pkl")
+    preprocessor_file_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    table_file_path: str = os.path.join("artifacts", "prediction_table.npy")
+    metadata_file_path: str = os.path.join("artifacts", "prediction_table.json")
+    min_score: int = 0
+    max_score: int = 100
+    chunk_size: int = 65536
+
+
+class PredictionTable:
+    """
+    Read-only, memory-mapped table of model predictions over the whole input grid.
+
+    One axis per input column (in CustomData order): categorical axes follow
+    the fitted one-hot category order, numeric axes cover the integer scores
+    `min_score..max_score`. Any record whose categories are known and whose
+    scores are whole numbers inside the range is answered with one index
+    lookup; everything else returns None so the caller can use the model.
+    """
+
+    def __init__(self, table, columns, categories, min_score, max_score, version):
+        self.table = table
+        self.columns = list(columns)
+        self.categories = categories
+        self.min_score = min_score
+        self.max_score = max_score
+        self.version = version
+        self._category_index = {
+            column: {category: index for index, category in enumerate(values)}
+            for column, values in categories.items()
+        }
+
+    @classmethod
+    def load(cls, config: PredictionTableConfig = None, expected_version: str = None):
+        """
+        Maps the table from disk, or returns None when it is missing or was
+        built for different model/preprocessor files than `expected_version`.
+        """
+        config = config or PredictionTableConfig()
+        if not os.path.exists(config.metadata_file_path):
+            return None
+
+        with open(config.metadata_file_path) as file_obj:
+            metadata = json.load(file_obj)
+        if expected_version is not None and metadata["version"] != expected_version:
+            logging.info(f"Prediction table version {metadata['version']} does not match {expected_version}, ignoring it")
+            return None
+
+        table = np.load(config.table_file_path, mmap_mode="r")
+        return cls(table, metadata["columns"], metadata["categories"],
+                   metadata["min_score"], metadata["max_score"], metadata["version"])
+
+    def _score_index(self, value):
+        if value is None:
+            return None
+        value = float(value)
+        if math.isnan(value) or not value.is_integer() or not self.min_score <= value <= self.max_score:
+            return None
+        return int(value) - self.min_score
+
+    def lookup(self, record):
+        """
+        Returns the prediction for a dict record, or None when it is off the grid.
+        """
+        index = []
+        for column in self.columns:
+            if column in self._category_index:
+                position = self._category_index[column].get(record[column])
+            else:
+                position = self._score_index(record[column])
+            if position is None:
+                return None
+            index.append(position)
+        return float(self.table[tuple(index)])
+
+    def lookup_frame(self, frame: pd.DataFrame):
+        """
+        Vectorized lookup for a DataFrame.
+
+        Returns:
+            tuple: (predictions as float64 with NaN for misses, boolean hit mask)
+        """
+        hits = np.ones(len(frame), dtype=bool)
+        indices = []
+        for column in self.columns:
+            if column in self.categories:
+                codes = pd.Index(self.categories[column]).get_indexer(frame[column]).astype(np.intp)
+                hits &= codes >= 0
+            else:
+                values = frame[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                hits &= (values == np.floor(values)) & (values >= self.min_score) & (values <= self.max_score)
+                codes = np.where(hits, values - self.min_score, 0).astype(np.intp)
+            indices.append(np.where(hits, codes, 0))
+
+        preds = np.asarray(self.table[tuple(indices)], dtype=np.float64)
+        preds[~hits] = np.nan
+        return preds, hits
+
+
+class PredictionTableBuilder:
+    """
+    Build step run after ModelTrainer: scores every point of the bounded input
+    space with the saved model and writes the result as a float32 .npy table
+    (about 10 MB for the student dataset) plus a JSON sidecar describing the axes.
+    """
+
+    def __init__(self, config: PredictionTableConfig = None):
+        self.config = config or PredictionTableConfig()
+
+    @staticmethod
+    def grid_axes(preprocessor):
+        """
+        The input columns (training order) and the fitted categories of the
+        categorical ones; every other column must be a numeric score. Returns
+        None, with a log line, when the fitted preprocessor does not describe
+        a bounded grid.
+        """
+        try:
+            categories = {column: [str(category) for category in values]
+                          for column, values in fitted_categories(preprocessor).items()}
+            columns = list(preprocessor.feature_names_in_)
+        except Exception as e:
+            logging.info(f"Cannot derive the prediction table axes, not building it: {e!r}")
+            return None
+        unbounded = [column for column in columns
+                     if column not in categories and column not in STUDENT_SCHEMA.numerical_columns]
+        if unbounded:
+            logging.info(f"Columns {unbounded} are neither one-hot encoded nor scores, not building the prediction table.")
+            return None
+        return columns, categories
+
+    def initiate_prediction_table(self):
+        try:
+            with open(self.config.model_file_path, "rb") as file_obj:
+                model_bytes = file_obj.read()
+            with open(self.config.preprocessor_file_path, "rb") as file_obj:
+                preprocessor_bytes = file_obj.read()
+            version = artifacts_version(model_bytes, preprocessor_bytes)
+            if PredictionTable.load(self.config, expected_version=version) is not None:
+                logging.info(f"Prediction table for version {version} is up to date, not rebuilding it.")
+                return self.config.table_file_path
+
+            model = pickle.loads(model_bytes)
+            preprocessor = pickle.loads(preprocessor_bytes)
+
+            axes = self.grid_axes(preprocessor)
+            if axes is None:
+                return None
+            columns, categories = axes
+            scores = np.arange(self.config.min_score, self.config.max_score + 1, dtype=np.float64)
+            axes = [np.asarray(categories[column], dtype=object) if column in categories else scores
+                    for column in columns]
+            shape = tuple(len(axis) for axis in axes)
+            total = int(np.prod(shape))
+            logging.info(f"Scoring {total} grid points for the prediction table, shape {shape}")
+
+            os.makedirs(os.path.dirname(self.config.table_file_path), exist_ok=True)
+            tmp_table_path = f"{self.config.table_file_path}.tmp.npy"
+            table = np.lib.format.open_memmap(tmp_table_path, mode="w+", dtype=np.float32, shape=shape)
+            flat = table.reshape(-1)
+
+            for start in range(0, total, self.config.chunk_size):
+                stop = min(start + self.config.chunk_size, total)
+                index = np.unravel_index(np.arange(start, stop), shape)
+                chunk = STUDENT_SCHEMA.frame({column: axis[positions] for column, axis, positions in zip(columns, axes, index)},
+                                             model_input=True)
+                flat[start:stop] = model.predict(preprocessor.transform(chunk))
+
+            table.flush()
+            del flat, table
+            os.replace(tmp_table_path, self.config.table_file_path)
+
+            # The sidecar is written last: its presence means the table is complete.
+            metadata = {
+                "version": version,
+                "columns": columns,
+                "categories": categories,
+                "min_score": self.config.min_score,
+                "max_score": self.config.max_score,
+                "shape": list(shape),
+            }
+            tmp_metadata_path = f"{self.config.metadata_file_path}.tmp"
+            with open(tmp_metadata_path, "w") as file_obj:
+                json.dump(metadata, file_obj, indent=2)
+            os.replace(tmp_metadata_path, self.config.metadata_file_path)
+
+            logging.info("Prediction table saved.")
+            return self.config.table_file_path
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,91 @@
+import math
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+from sklearn.base import clone
+
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import evaluate_models
+
+
+@dataclass
+class SuccessiveHalvingConfig:
+    # Training rows every family is fitted on in the first rung
+    min_samples: int = 1000
+    # Share of the candidates kept after each rung
+    keep_fraction: float = 0.5
+    # Factor the training sample grows by between rungs
+    growth_factor: int = 2
+    random_state: int = 42
+
+
+class SuccessiveHalving:
+    """
+    Picks the finalists by training every candidate on a small random subsample
+    of the training rows, keeping the best `keep_fraction` by test R2 and
+    growing the sample by `growth_factor` until the survivors are trained on
+    all of it. Each rung is one `evaluate_models` call, so worker processes,
+    the thread budget and early stopping apply unchanged.
+
+    The subsamples are nested prefixes of one shuffled order, so a candidate
+    always sees the rows of the previous rung plus new ones.
+    """
+
+    def __init__(self, config: SuccessiveHalvingConfig = None):
+        self.config = config or SuccessiveHalvingConfig()
+        self.rungs = []
+
+    def run(self, models, X_train, y_train, X_test, y_test, details=None, **evaluate_kwargs):
+        """
+        Args:
+            models (dict): Name -> unfitted estimator.
+            details (dict, optional): Filled with the fit details of the finalists.
+            **evaluate_kwargs: Passed to every evaluate_models call (n_jobs,
+                thread_budget, mode, fit_params, ...).
+
+        Returns:
+            tuple: (name -> test R2, name -> fitted estimator) for the
+            candidates of the last rung, trained on every training row.
+        """
+        try:
+            details = {} if details is None else details
+            fit_params = evaluate_kwargs.pop("fit_params", None) or {}
+            total = len(X_train)
+            order = np.random.default_rng(self.config.random_state).permutation(total)
+            sample_size = min(max(1, self.config.min_samples), total)
+            survivors = list(models)
+            self.rungs = []
+
+            while True:
+                rows = np.sort(order[:sample_size])
+                candidates = {name: clone(models[name]) for name in survivors}
+                rung_details = {}
+                report = evaluate_models(X_train=X_train[rows], y_train=y_train[rows], X_test=X_test, y_test=y_test,
+                                         models=candidates, details=rung_details,
+                                         fit_params={name: fit_params[name] for name in survivors if name in fit_params},
+                                         **evaluate_kwargs)
+                self.rungs.append({"sample_size": sample_size, "scores": report})
+                logging.info(f"Successive halving rung on {sample_size} rows: {report}")
+
+                if sample_size == total:
+                    break
+                ranked = sorted(survivors, key=lambda name: report[name], reverse=True)
+                survivors = ranked[:max(1, math.ceil(len(ranked) * self.config.keep_fraction))]
+                # A single survivor goes straight to the full data.
+                sample_size = total if len(survivors) == 1 else min(sample_size * self.config.growth_factor, total)
+
+            details.update(rung_details)
+            logging.info(f"Successive halving trained {self.rows_fitted()} candidate-rows "
+                         f"instead of {total * len(models)} for full selection")
+            return report, candidates
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def rows_fitted(self):
+        """
+        Training rows summed over every candidate fit of the last run.
+        """
+        return sum(rung["sample_size"] * len(rung["scores"]) for rung in self.rungs)
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import sklearn
+
+from src.logger import logging
+from src.thread_budget import THREAD_PARAMS
+from src.utils import load_object, save_object
+
+
+@dataclass
+class TrainingCacheConfig:
+    cache_dir: str = os.path.join("artifacts", "training_cache")
+    enabled: bool = True
+    # Bounds enforced after every store: entries unused for longer than
+    # `max_age_days` are removed, then the least recently used ones until the
+    # cache fits in `max_size_mb` (None disables a bound)
+    max_size_mb: float = 1024.0
+    max_age_days: float = 30.0
+
+
+def _update_digest(digest, value):
+    """
+    Feeds a value into the digest: arrays by dtype, shape and bytes,
+    containers recursively, anything else by repr.
+    """
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        digest.update(f"ndarray{value.dtype.str}{value.shape}".encode())
+        digest.update(value.tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _update_digest(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict{len(value)}".encode())
+        for key in sorted(value, key=str):
+            digest.update(str(key).encode())
+            _update_digest(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+
+
+def _library_versions(model):
+    root = type(model).__module__.split(".")[0]
+    return {
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        root: getattr(sys.modules.get(root), "__version__", None),
+    }
+
+
+class TrainingCache:
+    """
+    Content-addressed store of fitted candidates under artifacts/training_cache.
+
+    The key of a candidate hashes the training/scoring arrays, the estimator
+    class and parameters, its fit parameters and the numpy/sklearn/estimator
+    library versions; thread-count parameters are left out since they do not
+    change the fitted model. A hit returns the stored estimator, its test R2
+    and fit details, so an unchanged retrain skips the fit entirely.
+
+    A hit refreshes the entry's modification time, which the size and age
+    bounds use as its last use.
+    """
+
+    def __init__(self, config: TrainingCacheConfig = None):
+        self.config = config or TrainingCacheConfig()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def data_digest(*arrays):
+        digest = hashlib.sha256()
+        for array in arrays:
+            _update_digest(digest, array)
+        return digest.hexdigest()
+
+    def key(self, data_digest, model, fit_params=None, settings=None):
+        """
+        Args:
+            data_digest (str): `data_digest` of the arrays the model is fitted
+                and scored on.
+            model: The unfitted estimator.
+            fit_params (dict, optional): Extra fit arguments (arrays included).
+            settings (dict, optional): Evaluation settings that change the
+                stored metrics, e.g. the evaluation mode.
+        """
+        params = {name: value for name, value in model.get_params(deep=False).items()
+                  if name not in THREAD_PARAMS}
+        digest = hashlib.sha256(data_digest.encode())
+        digest.update(f"{type(model).__module__}.{type(model).__qualname__}".encode())
+        for value in (params, fit_params or {}, settings or {}):
+            _update_digest(digest, value)
+        digest.update(json.dumps(_library_versions(model), sort_keys=True).encode())
+        return digest.hexdigest()[:32]
+
+    def _path(self, key):
+        return os.path.join(self.config.cache_dir, f"{key}.pkl")
+
+    def get(self, key):
+        """
+        Returns (fitted model, test R2, details) or None on a miss.
+        """
+        if not self.config.enabled:
+            return None
+        path = self._path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        try:
+            entry = load_object(path)
+        except Exception as e:
+            logging.info(f"Ignoring unreadable training cache entry {path}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        os.utime(path)
+        return entry["model"], entry["score"], entry["details"]
+
+    def put(self, key, model, score, details):
+        if self.config.enabled:
+            save_object(file_path=self._path(key), obj={"model": model, "score": score, "details": details})
+            self.prune(keep=key)
+
+    def prune(self, keep=None):
+        """
+        Applies the age and size bounds. The entry `keep` (just stored) is
+        never removed.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        if not os.path.isdir(self.config.cache_dir):
+            return 0
+        entries = []
+        for name in os.listdir(self.config.cache_dir):
+            path = os.path.join(self.config.cache_dir, name)
+            if name.endswith(".pkl") and name != f"{keep}.pkl":
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:  # removed by a concurrent run
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()  # least recently used first
+
+        removed = []
+        if self.config.max_age_days is not None:
+            cutoff = time.time() - self.config.max_age_days * 86400
+            removed = [entry for entry in entries if entry[0] < cutoff]
+            entries = entries[len(removed):]
+        if self.config.max_size_mb is not None:
+            kept_size = os.path.getsize(self._path(keep)) if keep and os.path.exists(self._path(keep)) else 0
+            total = kept_size + sum(size for _, size, _ in entries)
+            while entries and total > self.config.max_size_mb * 2 ** 20:
+                entry = entries.pop(0)
+                total -= entry[1]
+                removed.append(entry)
+
+        for _, _, path in removed:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        if removed:
+            logging.info(f"Pruned {len(removed)} training cache entries")
+        self.evictions += len(removed)
+        return len(removed)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
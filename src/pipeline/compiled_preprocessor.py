@@ -0,0 +1,224 @@
+import math
+
+import numpy as np
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
+
+from src.logger import logging
+
+
+def is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _is_identity(step):
+    # A fitted ColumnTransformer stores "passthrough" as an identity FunctionTransformer.
+    return step == "passthrough" or (isinstance(step, FunctionTransformer)
+                                     and step.func is None and step.inverse_func is None)
+
+
+class NumericBlock:
+    """
+    Imputer + scaler over a group of numeric columns, as plain arrays.
+    """
+
+    def __init__(self, columns, start, fill, offset, scale):
+        self.columns = list(columns)
+        self.start = start
+        self.width = len(self.columns)
+        self.fill = fill
+        self.offset = offset
+        self.scale = scale
+
+    def encode(self, record, out):
+        for i, column in enumerate(self.columns):
+            value = record[column]
+            if is_missing(value):
+                value = self.fill[i] if self.fill is not None else math.nan
+            out[self.start + i] = (float(value) - self.offset[i]) / self.scale[i]
+
+    def encode_many(self, records, out):
+        for i, column in enumerate(self.columns):
+            values = np.array(
+                [math.nan if is_missing(record[column]) else float(record[column]) for record in records],
+                dtype=np.float64,
+            )
+            if self.fill is not None:
+                values[np.isnan(values)] = self.fill[i]
+            out[:, self.start + i] = (values - self.offset[i]) / self.scale[i]
+
+
+class CategoricalBlock:
+    """
+    Imputer + one-hot encoder over a group of categorical columns, as dicts
+    from category to output position.
+    """
+
+    def __init__(self, columns, start, fill, categories, handle_unknown):
+        self.columns = list(columns)
+        self.start = start
+        self.fill = fill
+        self.handle_unknown = handle_unknown
+        self.positions = []
+        position = start
+        for column_categories in categories:
+            self.positions.append({category: position + index for index, category in enumerate(column_categories)})
+            position += len(column_categories)
+        self.width = position - start
+
+    def _position(self, i, value):
+        if is_missing(value) and self.fill is not None:
+            value = self.fill[i]
+        position = self.positions[i].get(value)
+        if position is None and self.handle_unknown == "error":
+            raise ValueError(f"Found unknown categories [{value!r}] in column {i} during transform")
+        return position
+
+    def encode(self, record, out):
+        for i, column in enumerate(self.columns):
+            position = self._position(i, record[column])
+            if position is not None:
+                out[position] = 1.0
+
+    def encode_many(self, records, out):
+        for i, column in enumerate(self.columns):
+            for row, record in enumerate(records):
+                position = self._position(i, record[column])
+                if position is not None:
+                    out[row, position] = 1.0
+
+
+class CompiledPreprocessor:
+    """
+    Pandas-free replacement for the fitted ColumnTransformer.
+
+    The fitted imputer statistics, scaler means/scales and one-hot category
+    lists are copied out of preprocessor.pkl into arrays and dicts, so a raw
+    record becomes the model's feature vector without building a DataFrame.
+    The output matches `preprocessor.transform` value for value (dense).
+
+    Use `from_column_transformer` to build one; it raises ValueError for any
+    step it does not know how to reproduce exactly.
+    """
+
+    def __init__(self, input_columns, blocks, n_features):
+        self.input_columns = list(input_columns)
+        self.blocks = blocks
+        self.n_features = n_features
+
+    @classmethod
+    def from_column_transformer(cls, preprocessor):
+        if getattr(preprocessor, "sparse_output_", False):
+            raise ValueError("Sparse ColumnTransformer output is not supported")
+
+        blocks = []
+        used_columns = set()
+        start = 0
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == "drop" or len(columns) == 0:
+                continue
+            if any(not isinstance(column, str) for column in columns):
+                raise ValueError(f"Transformer {name} selects columns by position")
+
+            block = cls._compile_block(name, transformer, columns, start)
+            blocks.append(block)
+            used_columns.update(columns)
+            start += block.width
+
+        # Keep the training column order, which is also the CustomData field order.
+        input_columns = [column for column in preprocessor.feature_names_in_ if column in used_columns]
+        return cls(input_columns, blocks, start)
+
+    @staticmethod
+    def _compile_block(name, transformer, columns, start):
+        if isinstance(transformer, Pipeline):
+            steps = [step for _, step in transformer.steps if not _is_identity(step)]
+        else:
+            steps = [] if _is_identity(transformer) else [transformer]
+
+        fill = None
+        if steps and isinstance(steps[0], SimpleImputer):
+            imputer = steps.pop(0)
+            if imputer.add_indicator or not is_missing(imputer.missing_values):
+                raise ValueError(f"Unsupported SimpleImputer settings in {name}")
+            fill = list(imputer.statistics_)
+
+        if len(steps) == 1 and isinstance(steps[0], OneHotEncoder):
+            encoder = steps[0]
+            if encoder.drop_idx_ is not None or encoder.handle_unknown not in ("error", "ignore"):
+                raise ValueError(f"Unsupported OneHotEncoder settings in {name}")
+            # min_frequency / max_categories merge categories into one output column.
+            if getattr(encoder, "_infrequent_enabled", False) or any(
+                    categories is not None for categories in getattr(encoder, "infrequent_categories_", [])):
+                raise ValueError(f"OneHotEncoder in {name} groups infrequent categories")
+            return CategoricalBlock(columns, start, fill, encoder.categories_, encoder.handle_unknown)
+
+        offset = np.zeros(len(columns))
+        scale = np.ones(len(columns))
+        if len(steps) == 1 and isinstance(steps[0], StandardScaler):
+            scaler = steps[0]
+            if scaler.with_mean:
+                offset = np.asarray(scaler.mean_, dtype=np.float64)
+            if scaler.with_std:
+                scale = np.asarray(scaler.scale_, dtype=np.float64)
+        elif steps:
+            raise ValueError(f"Unsupported steps in {name}: {[type(step).__name__ for step in steps]}")
+
+        return NumericBlock(columns, start, fill, offset, scale)
+
+    def _as_mapping(self, record):
+        if isinstance(record, dict):
+            return record
+        if len(record) != len(self.input_columns):
+            raise ValueError(f"Expected {len(self.input_columns)} values in {self.input_columns} order, got {len(record)}")
+        return dict(zip(self.input_columns, record))
+
+    def transform_record(self, record) -> np.ndarray:
+        """
+        Encodes one record (dict, or tuple in `input_columns` order).
+
+        Returns:
+            np.ndarray: 1-D feature vector of length `n_features`.
+        """
+        record = self._as_mapping(record)
+        out = np.zeros(self.n_features, dtype=np.float64)
+        for block in self.blocks:
+            block.encode(record, out)
+        return out
+
+    def transform_records(self, records) -> np.ndarray:
+        """
+        Encodes a sequence of records into a (n_records, n_features) matrix.
+        """
+        records = [self._as_mapping(record) for record in records]
+        out = np.zeros((len(records), self.n_features), dtype=np.float64)
+        for block in self.blocks:
+            block.encode_many(records, out)
+        return out
+
+
+def fitted_categories(preprocessor, handle_unknown=None):
+    """
+    Column -> categories of every one-hot encoder in the fitted
+    ColumnTransformer, optionally only the encoders with that `handle_unknown`.
+    """
+    categories = {}
+    for _, transformer, columns in preprocessor.transformers_:
+        steps = [step for _, step in transformer.steps] if isinstance(transformer, Pipeline) else [transformer]
+        for step in steps:
+            if isinstance(step, OneHotEncoder) and handle_unknown in (None, step.handle_unknown):
+                categories.update(zip(columns, step.categories_))
+    return categories
+
+
+def compile_preprocessor(preprocessor):
+    """
+    Returns a CompiledPreprocessor, or None when the fitted preprocessor uses
+    steps that cannot be reproduced exactly (serving then keeps the sklearn path).
+    """
+    try:
+        return CompiledPreprocessor.from_column_transformer(preprocessor)
+    except (ValueError, AttributeError) as e:
+        logging.info(f"Preprocessor not compiled, using sklearn transform: {e}")
+        return None
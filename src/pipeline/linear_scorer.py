@@ -0,0 +1,156 @@
+import math
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import (
+    ElasticNet,
+    ElasticNetCV,
+    HuberRegressor,
+    Lasso,
+    LassoCV,
+    LinearRegression,
+    Ridge,
+    RidgeCV,
+    SGDRegressor,
+)
+
+from src.logger import logging
+from src.pipeline.compiled_preprocessor import CategoricalBlock, is_missing
+
+# Regressors whose predict is exactly X @ coef_ + intercept_
+LINEAR_MODELS = (
+    LinearRegression,
+    Ridge,
+    RidgeCV,
+    Lasso,
+    LassoCV,
+    ElasticNet,
+    ElasticNetCV,
+    SGDRegressor,
+    HuberRegressor,
+)
+
+
+class _CategoricalTerm:
+    def __init__(self, column, categories, contributions, fill, handle_unknown):
+        self.column = column
+        self.categories = list(categories)
+        self.index = pd.Index(self.categories)
+        self.lookup = dict(zip(self.categories, contributions.tolist()))
+        # Trailing zero so that code -1 (unknown, ignored) gathers 0.
+        self.table = np.append(contributions, 0.0)
+        self.fill_code = self.categories.index(fill) if fill is not None and fill in self.lookup else -1
+        self.fill = fill
+        self.handle_unknown = handle_unknown
+
+
+class FusedLinearScorer:
+    """
+    Fuses the compiled preprocessor and a fitted linear model into lookups.
+
+    With one-hot encoding, scaling and a dot product folded together, a
+    prediction is the bias plus one table entry per categorical column plus
+    one weighted term per numeric column:
+
+        pred = bias + sum(table[column][category]) + sum(weight[column] * value)
+
+    where weight = coef / scale and the scaler offsets are folded into bias.
+    Results equal `model.predict(preprocessor.transform(X))` up to floating
+    point summation order.
+    """
+
+    def __init__(self, bias, numeric_columns, numeric_weights, numeric_fill, categorical_terms):
+        self.bias = float(bias)
+        self.numeric_columns = list(numeric_columns)
+        self.numeric_weights = np.asarray(numeric_weights, dtype=np.float64)
+        self.numeric_fill = np.asarray(numeric_fill, dtype=np.float64)
+        self.categorical_terms = categorical_terms
+
+    @classmethod
+    def from_fitted(cls, compiled_preprocessor, model):
+        if not isinstance(model, LINEAR_MODELS):
+            raise ValueError(f"{type(model).__name__} is not a supported linear model")
+
+        coef = np.ravel(np.asarray(model.coef_, dtype=np.float64))
+        if coef.shape[0] != compiled_preprocessor.n_features:
+            raise ValueError("Model coefficients do not match the preprocessor output")
+        bias = float(np.ravel(np.asarray(model.intercept_, dtype=np.float64))[0])
+
+        numeric_columns, numeric_weights, numeric_fill = [], [], []
+        categorical_terms = []
+        for block in compiled_preprocessor.blocks:
+            if isinstance(block, CategoricalBlock):
+                for i, column in enumerate(block.columns):
+                    positions = block.positions[i]
+                    categories = list(positions)
+                    contributions = coef[[positions[category] for category in categories]]
+                    fill = block.fill[i] if block.fill is not None else None
+                    categorical_terms.append(
+                        _CategoricalTerm(column, categories, contributions, fill, block.handle_unknown)
+                    )
+            else:
+                for i, column in enumerate(block.columns):
+                    weight = coef[block.start + i] / block.scale[i]
+                    numeric_columns.append(column)
+                    numeric_weights.append(weight)
+                    numeric_fill.append(block.fill[i] if block.fill is not None else math.nan)
+                    bias -= weight * block.offset[i]
+
+        return cls(bias, numeric_columns, numeric_weights, numeric_fill, categorical_terms)
+
+    def _unknown(self, term, value):
+        if term.handle_unknown == "error":
+            raise ValueError(f"Found unknown categories [{value!r}] in column {term.column} during transform")
+        return 0.0
+
+    def score_record(self, record) -> float:
+        """
+        Scores one dict record with a handful of adds and lookups.
+        """
+        total = self.bias
+        for i, column in enumerate(self.numeric_columns):
+            value = record[column]
+            if is_missing(value):
+                value = self.numeric_fill[i]
+            total += self.numeric_weights[i] * float(value)
+        for term in self.categorical_terms:
+            value = record[term.column]
+            if is_missing(value):
+                value = term.fill
+            contribution = term.lookup.get(value)
+            total += contribution if contribution is not None else self._unknown(term, value)
+        return total
+
+    def score_frame(self, frame: pd.DataFrame) -> np.ndarray:
+        """
+        Scores a DataFrame with vectorized NumPy gathers, no sklearn call.
+        """
+        total = np.full(len(frame), self.bias, dtype=np.float64)
+        for i, column in enumerate(self.numeric_columns):
+            values = frame[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            values = np.where(np.isnan(values), self.numeric_fill[i], values)
+            total += self.numeric_weights[i] * values
+        for term in self.categorical_terms:
+            column = frame[term.column]
+            codes = term.index.get_indexer(column).astype(np.intp)
+            missing = column.isna().to_numpy()
+            codes[missing] = term.fill_code
+            unknown = (codes == -1) & ~missing
+            if unknown.any() and term.handle_unknown == "error":
+                self._unknown(term, column[unknown].iloc[0])
+            total += term.table[codes]
+        return total
+
+
+def build_linear_scorer(compiled_preprocessor, model):
+    """
+    Returns a FusedLinearScorer when the model is linear and the preprocessor
+    compiled, otherwise None (serving keeps the model.predict path).
+    """
+    if compiled_preprocessor is None or not isinstance(model, LINEAR_MODELS):
+        return None
+    try:
+        return FusedLinearScorer.from_fitted(compiled_preprocessor, model)
+    except ValueError as e:
+        logging.info(f"Linear scorer not built, using model.predict: {e}")
+        return None
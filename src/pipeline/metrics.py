@@ -0,0 +1,152 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Histogram:
+    """
+    Thread-safe histogram with fixed bucket upper bounds (counts are per bucket, not cumulative).
+
+    Args:
+        buckets (list[float]): Increasing upper bounds; values above the last
+            bound land in the "+Inf" bucket.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            if value > self._max:
+                self._max = value
+
+    def percentile(self, q):
+        """
+        Estimates the q-th percentile (0-100) by interpolating inside the bucket
+        that holds it.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            count = self._count
+            maximum = self._max
+        if count == 0:
+            return 0.0
+
+        rank = q / 100.0 * count
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else maximum
+                upper = min(upper, maximum)
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return maximum
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            count = self._count
+            total = self._sum
+            maximum = self._max
+
+        labels = [f"<={bound:g}" for bound in self.buckets] + ["+Inf"]
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "max": maximum,
+            "buckets": dict(zip(labels, counts)),
+        }
+
+
+def latency_buckets_ms(start=0.005, stop=60000.0, factor=1.25):
+    """
+    Geometric bucket bounds in milliseconds, fine enough for percentile estimates.
+    """
+    buckets = []
+    bound = start
+    while bound < stop:
+        buckets.append(round(bound, 6))
+        bound *= factor
+    buckets.append(stop)
+    return buckets
+
+
+class ServingMetrics:
+    """
+    In-process latency histograms per stage plus throughput counters.
+
+    Use `with metrics.time("transform"): ...` around a stage and
+    `metrics.increment("requests.predictdata")` for counters; `snapshot`
+    reports p50/p90/p99 per stage and per-second rates since start.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._buckets = latency_buckets_ms()
+        self._stages = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def _stage(self, stage):
+        histogram = self._stages.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._stages.setdefault(stage, Histogram(self._buckets))
+        return histogram
+
+    def observe(self, stage, elapsed_ms):
+        self._stage(stage).observe(elapsed_ms)
+
+    @contextmanager
+    def time(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, (time.perf_counter() - started) * 1000.0)
+
+    def increment(self, counter, amount=1):
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def snapshot(self) -> dict:
+        uptime = max(time.time() - self.started_at, 1e-9)
+        with self._lock:
+            stages = dict(self._stages)
+            counters = dict(self._counters)
+
+        stage_report = {}
+        for stage, histogram in sorted(stages.items()):
+            summary = histogram.snapshot()
+            stage_report[stage] = {
+                "count": summary["count"],
+                "mean_ms": summary["mean"],
+                "p50_ms": histogram.percentile(50),
+                "p90_ms": histogram.percentile(90),
+                "p99_ms": histogram.percentile(99),
+                "max_ms": summary["max"],
+            }
+
+        return {
+            "uptime_seconds": uptime,
+            "stages": stage_report,
+            "counters": {
+                name: {"total": value, "per_second": value / uptime}
+                for name, value in sorted(counters.items())
+            },
+        }
+
+
+serving_metrics = ServingMetrics()
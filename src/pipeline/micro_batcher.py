@@ -0,0 +1,137 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+import pandas as pd
+
+from src.logger import logging
+from src.pipeline.metrics import Histogram
+
+
+@dataclass
+class MicroBatcherConfig:
+    max_batch_size: int = 64
+    max_wait_ms: float = 2.0
+
+
+class MicroBatcher:
+    """
+    Groups concurrent small prediction requests into one vectorized call.
+
+    Each caller submits its own feature frame (usually one row from
+    CustomData). A single worker thread takes the first waiting request, keeps
+    collecting until either `max_batch_size` rows are queued or `max_wait_ms`
+    has passed, scores the concatenated frame once and hands every caller the
+    slice of predictions that belongs to it.
+
+    Args:
+        predict_fn (callable): Scores a DataFrame and returns one prediction per row,
+            e.g. `PredictPipeline.predict`.
+        config (MicroBatcherConfig, optional): Batch window settings.
+    """
+
+    def __init__(self, predict_fn, config: MicroBatcherConfig = None):
+        self.predict_fn = predict_fn
+        self.config = config or MicroBatcherConfig()
+        self._queue = queue.Queue()
+        self._closed = threading.Event()
+        self.batch_size_histogram = Histogram([1, 2, 4, 8, 16, 32, 64, 128, 256])
+        self.queue_wait_ms_histogram = Histogram([0.5, 1, 2, 5, 10, 25, 50, 100])
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, features: pd.DataFrame) -> Future:
+        if self._closed.is_set():
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        self._queue.put((features, future, time.perf_counter()))
+        return future
+
+    def predict(self, features: pd.DataFrame):
+        """
+        Blocks until the batch containing `features` is scored.
+        """
+        return self.submit(features).result()
+
+    def close(self):
+        self._closed.set()
+        self._queue.put(None)
+        self._worker.join()
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_batch_size": self.config.max_batch_size,
+            "max_wait_ms": self.config.max_wait_ms,
+            "batch_size": self.batch_size_histogram.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms_histogram.snapshot(),
+        }
+
+    def _collect(self, first):
+        batch = [first]
+        rows = len(first[0])
+        deadline = time.perf_counter() + self.config.max_wait_ms / 1000.0
+        while rows < self.config.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch, rows
+
+    def _score(self, batch):
+        """
+        Scores a batch in one call. If that fails, every request is retried on
+        its own so that one bad request only fails its own caller.
+        """
+        try:
+            frames = [features for features, _, _ in batch]
+            features = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            preds = self.predict_fn(features)
+        except Exception as e:
+            # CustomException's str() is not always a string, so log the repr.
+            logging.error(f"Micro-batch of {len(batch)} requests failed: {e!r}")
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            for item in batch:
+                self._score([item])
+            return
+
+        offset = 0
+        for features, future, _ in batch:
+            future.set_result(preds[offset:offset + len(features)])
+            offset += len(features)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            try:
+                batch, rows = self._collect(first)
+                started = time.perf_counter()
+                for _, _, enqueued in batch:
+                    self.queue_wait_ms_histogram.observe((started - enqueued) * 1000.0)
+                self.batch_size_histogram.observe(rows)
+                self._score(batch)
+            except Exception as e:
+                # The worker must outlive any failure, or every caller blocks forever.
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                try:
+                    logging.error(f"Micro-batcher failed on a batch: {e!r}")
+                except Exception:
+                    pass
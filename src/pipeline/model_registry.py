@@ -0,0 +1,248 @@
+import dataclasses
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+
+from src.components.prediction_table import PredictionTable, PredictionTableConfig
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.compiled_preprocessor import compile_preprocessor
+from src.pipeline.linear_scorer import build_linear_scorer
+from src.utils import artifacts_version, read_artifacts_manifest
+
+
+@dataclass
+class ModelRegistryConfig:
+    model_path: str = os.path.join("artifacts", "model.pkl")
+    preprocessor_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    # Written by the trainer after model.pkl; a reload happens only for the pair it names
+    manifest_path: str = os.path.join("artifacts", "manifest.json")
+    poll_interval: float = 5.0
+    # How long the first `get` waits for a consistent model/preprocessor pair
+    load_timeout: float = 30.0
+    use_prediction_table: bool = True
+    prediction_table_config: PredictionTableConfig = field(default_factory=PredictionTableConfig)
+
+
+@dataclass(frozen=True)
+class ModelArtifacts:
+    """
+    Immutable snapshot of the artifacts used to serve one request.
+
+    Attributes:
+        model: The fitted estimator loaded from model.pkl.
+        preprocessor: The fitted ColumnTransformer loaded from preprocessor.pkl.
+        compiled_preprocessor: Pandas-free CompiledPreprocessor built from the
+            preprocessor, or None when it cannot be compiled.
+        linear_scorer: FusedLinearScorer when the model is linear, else None.
+        prediction_table: PredictionTable built for exactly these two files, else None.
+        version (str): Content checksum of both pickles, changes on every reload.
+        loaded_at (float): Unix timestamp of the load.
+    """
+    model: object
+    preprocessor: object
+    compiled_preprocessor: object
+    linear_scorer: object
+    prediction_table: object
+    version: str
+    loaded_at: float
+
+
+class ModelRegistry:
+    """
+    Process-wide holder of the serving artifacts.
+
+    The model and preprocessor are unpickled once and shared by every request
+    and thread. A background watcher compares the file stamps (mtime and size)
+    and, when they change, reads and unpickles the new files off the request
+    path before swapping the snapshot in a single assignment. Requests never
+    touch the disk once the first snapshot is loaded.
+
+    A training run rewrites preprocessor.pkl minutes before model.pkl, so the
+    watcher keys on the manifest the trainer writes last and only publishes a
+    pair whose bytes match the checksums it records. Without a manifest it keys
+    on model.pkl. Either way a pair whose preprocessor output width differs from
+    the model's input width is never published.
+    """
+
+    def __init__(self, config: ModelRegistryConfig = None):
+        self.config = config or ModelRegistryConfig()
+        self._artifacts = None
+        self._stamps = None
+        self._load_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watcher = None
+        self._reload_listeners = []
+
+    def add_reload_listener(self, listener):
+        """
+        Registers `listener(artifacts)`, called after every new snapshot is swapped in.
+        """
+        self._reload_listeners.append(listener)
+
+    def _notify(self, artifacts):
+        for listener in self._reload_listeners:
+            try:
+                listener(artifacts)
+            except Exception as e:
+                logging.error(f"Model registry reload listener failed: {e!r}")
+
+    def get(self) -> ModelArtifacts:
+        """
+        Returns the current artifacts snapshot, loading it on first use.
+        """
+        artifacts = self._artifacts
+        if artifacts is None:
+            with self._load_lock:
+                deadline = time.monotonic() + self.config.load_timeout
+                while self._artifacts is None and not self._load():
+                    if time.monotonic() > deadline:
+                        raise CustomException(RuntimeError(
+                            f"No consistent model/preprocessor pair after {self.config.load_timeout}s"), sys)
+                    time.sleep(0.1)
+            artifacts = self._artifacts
+        return artifacts
+
+    def refresh(self) -> bool:
+        """
+        Reloads the artifacts if the manifest (or model.pkl) changed on disk.
+
+        Returns:
+            bool: True when a new snapshot was swapped in.
+        """
+        with self._load_lock:
+            if self._artifacts is not None and self._read_stamps() == self._stamps:
+                return False
+            return self._load()
+
+    def start_watcher(self):
+        """
+        Starts the daemon thread that polls the artifact files for changes.
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_event.clear()
+        self._watcher = threading.Thread(target=self._watch, name="model-registry-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self):
+        while not self._stop_event.wait(self.config.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # str() of a CustomException is not always a string; log the repr and
+                # never let a failed reload end the watcher.
+                try:
+                    logging.error(f"Model registry reload failed, keeping the current artifacts: {e!r}")
+                except Exception:
+                    pass
+
+    def _read_stamps(self):
+        stamps = []
+        trigger = self.config.manifest_path if os.path.exists(self.config.manifest_path) else self.config.model_path
+        stat = os.stat(trigger)
+        stamps.append((trigger, stat.st_mtime_ns, stat.st_size))
+
+        # The prediction table is optional and usually lands after model.pkl.
+        metadata_path = self.config.prediction_table_config.metadata_file_path
+        if self.config.use_prediction_table and os.path.exists(metadata_path):
+            stat = os.stat(metadata_path)
+            stamps.append((metadata_path, stat.st_mtime_ns, stat.st_size))
+        return tuple(stamps)
+
+    def _load_prediction_table(self, version):
+        if not self.config.use_prediction_table:
+            return None
+        return PredictionTable.load(self.config.prediction_table_config, expected_version=version)
+
+    def _load(self) -> bool:
+        try:
+            stamps = self._read_stamps()
+            checksums = read_artifacts_manifest(self.config.manifest_path)
+            with open(self.config.model_path, "rb") as file_obj:
+                model_bytes = file_obj.read()
+            with open(self.config.preprocessor_path, "rb") as file_obj:
+                preprocessor_bytes = file_obj.read()
+
+            # A new training run writes the two files one after the other; only
+            # accept a pair that did not change while it was being read and, when
+            # there is a manifest, is the pair it names.
+            if self._read_stamps() != stamps:
+                logging.info("Artifacts changed while loading, retrying on the next poll.")
+                return False
+            if checksums is not None and (
+                    checksums.get("model") != hashlib.sha256(model_bytes).hexdigest()
+                    or checksums.get("preprocessor") != hashlib.sha256(preprocessor_bytes).hexdigest()):
+                logging.info("Model and preprocessor do not match the manifest, retrying on the next poll.")
+                return False
+
+            version = artifacts_version(model_bytes, preprocessor_bytes)
+
+            if self._artifacts is not None and self._artifacts.version == version:
+                prediction_table = self._load_prediction_table(version)
+                self._stamps = stamps
+                if prediction_table is None and self._artifacts.prediction_table is None:
+                    return False
+                self._artifacts = dataclasses.replace(self._artifacts, prediction_table=prediction_table)
+                logging.info(f"Reloaded prediction table for artifacts version {version}")
+                self._notify(self._artifacts)
+                return True
+
+            model = pickle.loads(model_bytes)
+            preprocessor = pickle.loads(preprocessor_bytes)
+            width, expected_width = _output_width(preprocessor), getattr(model, "n_features_in_", None)
+            if width is not None and expected_width is not None and width != expected_width:
+                logging.info(f"Preprocessor outputs {width} features but the model expects {expected_width}, "
+                             "retrying on the next poll.")
+                return False
+            compiled_preprocessor = compile_preprocessor(preprocessor)
+            artifacts = ModelArtifacts(
+                model=model,
+                preprocessor=preprocessor,
+                compiled_preprocessor=compiled_preprocessor,
+                linear_scorer=build_linear_scorer(compiled_preprocessor, model),
+                prediction_table=self._load_prediction_table(version),
+                version=version,
+                loaded_at=time.time(),
+            )
+            self._artifacts = artifacts
+            self._stamps = stamps
+            logging.info(f"Loaded model artifacts version {version}")
+            self._notify(artifacts)
+            return True
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+def _output_width(preprocessor):
+    try:
+        return len(preprocessor.get_feature_names_out())
+    except Exception:
+        return None
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Returns the registry shared by the whole process.
+    """
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                _default_registry = ModelRegistry()
+    return _default_registry
@@ -1,28 +1,114 @@
+import argparse
 import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 from src.exception import CustomException
-from src.utils import load_object
+from src.logger import logging
+from src.pipeline.compiled_preprocessor import fitted_categories
+from src.pipeline.model_registry import ModelRegistry, ModelRegistryConfig, get_model_registry
+from src.pipeline.metrics import ServingMetrics, serving_metrics
+from src.pipeline.prediction_cache import PredictionCache
+from src.schema import STUDENT_SCHEMA
+
+FEATURE_COLUMNS = STUDENT_SCHEMA.feature_columns
+NUMERICAL_COLUMNS = STUDENT_SCHEMA.numerical_columns
 
 
 class PredictPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, registry: ModelRegistry = None, cache: PredictionCache = None,
+                 metrics: ServingMetrics = None):
+        self.registry = registry or get_model_registry()
+        self.cache = cache
+        self.metrics = metrics or serving_metrics
+        if cache is not None:
+            self.registry.add_reload_listener(cache.invalidate)
 
     def predict(self,features):
         try:
-            model_path=os.path.join("artifacts","model.pkl")
-            preprocessor_path=os.path.join('artifacts','preprocessor.pkl')
-            print("Before Loading")
-            model=load_object(file_path=model_path)
-            preprocessor=load_object(file_path=preprocessor_path)
-            print("After Loading")
-            data_scaled=preprocessor.transform(features)
-            preds=model.predict(data_scaled)
-            return preds
+            with self.metrics.time("artifact_load"):
+                artifacts=self.registry.get()
+            if artifacts.prediction_table is not None:
+                with self.metrics.time("table_lookup"):
+                    preds,hits=artifacts.prediction_table.lookup_frame(features)
+                if not hits.all():
+                    preds[~hits]=self._predict_frame(artifacts,features[~hits])
+                return preds
+            return self._predict_frame(artifacts,features)
         
         except Exception as e:
             raise CustomException(e,sys)
+
+    def validate_categories(self,features):
+        """
+        Raises ValueError naming the first row whose category the fitted
+        one-hot encoder has never seen (missing values are imputed, not checked).
+        """
+        preprocessor=self.registry.get().preprocessor
+        for column,categories in fitted_categories(preprocessor,handle_unknown="error").items():
+            values=features[column]
+            unknown=~(values.isin(categories)|values.isna())
+            if unknown.any():
+                position=int(np.flatnonzero(unknown.to_numpy())[0])
+                raise ValueError(f"Record {position} has an unknown {column} {values.iloc[position]!r}, "
+                                 f"expected one of {sorted(map(str,categories))}")
+
+    def _predict_frame(self,artifacts,features):
+        if artifacts.linear_scorer is not None:
+            with self.metrics.time("predict"):
+                return artifacts.linear_scorer.score_frame(features)
+        with self.metrics.time("transform"):
+            data_scaled=artifacts.preprocessor.transform(STUDENT_SCHEMA.cast(features,model_input=True))
+        with self.metrics.time("predict"):
+            return artifacts.model.predict(data_scaled)
+
+    def predict_record(self,record,micro_batcher=None):
+        """
+        Scores a single record (dict keyed by the CustomData fields) without
+        building a DataFrame: a cache hit, a prediction table lookup for
+        in-grid records, otherwise the fused linear scorer or the compiled
+        preprocessor. With a `micro_batcher`, cache misses are queued on it
+        as a one-row frame instead.
+        """
+        try:
+            with self.metrics.time("artifact_load"):
+                artifacts=self.registry.get()
+            if micro_batcher is not None:
+                score=lambda rec: micro_batcher.predict(get_records_as_data_frame([rec]))
+            else:
+                score=lambda rec: self._predict_record(artifacts,rec)
+            if self.cache is None:
+                return score(record)
+
+            with self.metrics.time("cache_lookup"):
+                key=normalize_record(record)
+                pred=self.cache.get(key,artifacts.version)
+            if pred is None:
+                pred=score(dict(zip(FEATURE_COLUMNS,key)))
+                self.cache.put(key,artifacts.version,pred)
+            return pred
+
+        except Exception as e:
+            raise CustomException(e,sys)
+
+    def _predict_record(self,artifacts,record):
+        if artifacts.prediction_table is not None:
+            with self.metrics.time("table_lookup"):
+                pred=artifacts.prediction_table.lookup(record)
+            if pred is not None:
+                return np.array([pred])
+        if artifacts.linear_scorer is not None:
+            with self.metrics.time("predict"):
+                return np.array([artifacts.linear_scorer.score_record(record)])
+        if artifacts.compiled_preprocessor is None:
+            return self._predict_frame(artifacts,get_records_as_data_frame([record]))
+        with self.metrics.time("transform"):
+            features=artifacts.compiled_preprocessor.transform_record(record)
+        with self.metrics.time("predict"):
+            return artifacts.model.predict(features.reshape(1,-1))
         
 class CustomData:
     def __init__(self,gender: str,
@@ -48,20 +134,153 @@ class CustomData:
 
         self.writing_score = writing_score
         
+    def get_data_as_dict(self):
+        return {column: getattr(self, column) for column in FEATURE_COLUMNS}
+
     def get_data_as_data_frame(self):
         try:
-            custom_data_input_dict = {
-                "gender": [self.gender],
-                "race_ethnicity": [self.race_ethnicity],
-                "parental_level_of_education": [self.parental_level_of_education],
-                "lunch": [self.lunch],
-                "test_preparation_course": [self.test_preparation_course],
-                "reading_score": [self.reading_score],
-                "writing_score": [self.writing_score],
-            }
-
-            return pd.DataFrame(custom_data_input_dict)
+            custom_data_input_dict = {column: [getattr(self, column)] for column in FEATURE_COLUMNS}
+
+            return STUDENT_SCHEMA.frame(custom_data_input_dict, FEATURE_COLUMNS, model_input=True, categorize=False)
 
         except Exception as e:
             raise CustomException(e, sys)
-        
\ No newline at end of file
+
+def get_records_as_data_frame(records):
+    """
+    Builds one columnar DataFrame from a list of student records.
+
+    Args:
+        records (list[dict]): Records keyed by the CustomData field names.
+
+    Raises:
+        ValueError: If a record is not a mapping, misses a field or has a
+            non numeric score.
+
+    Returns:
+        pd.DataFrame: One row per record, columns in FEATURE_COLUMNS order.
+    """
+    columns = {column: [] for column in FEATURE_COLUMNS}
+    for position, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise ValueError(f"Record {position} is not an object")
+        missing = [column for column in FEATURE_COLUMNS if column not in record]
+        if missing:
+            raise ValueError(f"Record {position} is missing {', '.join(missing)}")
+        for column in FEATURE_COLUMNS:
+            value = record[column]
+            if column in NUMERICAL_COLUMNS:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Record {position} has a non numeric {column}")
+            columns[column].append(value)
+
+    return STUDENT_SCHEMA.frame(columns, FEATURE_COLUMNS, model_input=True, categorize=False)
+
+def normalize_record(record):
+    """
+    Canonical form of a record used as the prediction cache key: the seven
+    CustomData fields in order, text stripped and scores as floats.
+    """
+    values = []
+    for column in FEATURE_COLUMNS:
+        value = record[column]
+        if column in NUMERICAL_COLUMNS:
+            value = float(value)
+        elif isinstance(value, str):
+            value = value.strip()
+        values.append(value)
+    return tuple(values)
+
+
+_worker_pipeline = None
+
+
+def _init_score_worker(registry_config):
+    # Runs once per worker process: load the artifacts a single time.
+    global _worker_pipeline
+    _worker_pipeline = PredictPipeline(registry=ModelRegistry(registry_config))
+    _worker_pipeline.registry.get()
+
+
+def _score_chunk(features):
+    return _worker_pipeline.predict(features)
+
+
+def score_csv(input_path, output_path, chunk_size=50000, workers=None, registry_config: ModelRegistryConfig = None):
+    """
+    Scores a student CSV in fixed-size chunks and streams the predictions to
+    `output_path` as a single `math_score` column, in input order.
+
+    Chunks are fanned out to a process pool whose workers load the artifacts
+    once. At most two chunks per worker are in flight, so memory stays flat
+    whatever the size of the input file.
+
+    Args:
+        input_path (str): CSV with at least the CustomData columns.
+        output_path (str): Destination CSV.
+        chunk_size (int): Rows per chunk.
+        workers (int, optional): Worker processes, defaults to the CPU count;
+            0 scores in the current process.
+        registry_config (ModelRegistryConfig, optional): Artifact locations.
+
+    Returns:
+        int: Number of rows scored.
+    """
+    try:
+        registry_config = registry_config or ModelRegistryConfig()
+        workers = os.cpu_count() if workers is None else workers
+        reader = STUDENT_SCHEMA.read_csv(input_path, columns=FEATURE_COLUMNS, model_input=True, chunksize=chunk_size)
+        rows = 0
+
+        with open(output_path, "w", newline="") as output_file:
+            output_file.write("math_score\n")
+
+            def write(preds):
+                pd.DataFrame({"math_score": preds}).to_csv(output_file, header=False, index=False)
+
+            if workers == 0:
+                pipeline = PredictPipeline(registry=ModelRegistry(registry_config))
+                for chunk in reader:
+                    write(pipeline.predict(chunk[FEATURE_COLUMNS]))
+                    rows += len(chunk)
+                return rows
+
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_score_worker,
+                                     initargs=(registry_config,)) as executor:
+                pending = deque()
+                for chunk in reader:
+                    pending.append(executor.submit(_score_chunk, chunk[FEATURE_COLUMNS]))
+                    rows += len(chunk)
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+
+        logging.info(f"Scored {rows} rows from {input_path} into {output_path}")
+        return rows
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Student math score prediction")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    score_parser = subparsers.add_parser("score", help="Bulk-score a CSV of students")
+    score_parser.add_argument("--input", required=True, help="CSV with the CustomData columns")
+    score_parser.add_argument("--output", required=True, help="Where to write the predicted math_score column")
+    score_parser.add_argument("--chunk-size", type=int, default=50000, help="Rows per chunk")
+    score_parser.add_argument("--workers", type=int, default=None,
+                              help="Worker processes (default: CPU count, 0: no pool)")
+
+    args = parser.parse_args(argv)
+    if args.command == "score":
+        rows = score_csv(args.input, args.output, chunk_size=args.chunk_size, workers=args.workers)
+        print(f"Scored {rows} rows into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
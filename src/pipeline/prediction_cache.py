@@ -0,0 +1,83 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass
+class PredictionCacheConfig:
+    max_size: int = 10000
+    ttl_seconds: float = None
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of predictions with an optional TTL.
+
+    Entries are tagged with the artifacts version they were computed with; a
+    lookup under a different version is a miss, and `invalidate` (hooked to
+    the model registry's reload listeners) drops everything at once.
+    """
+
+    def __init__(self, config: PredictionCacheConfig = None):
+        self.config = config or PredictionCacheConfig()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, entry_version, stored_at = entry
+            if entry_version != version:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            if self.config.ttl_seconds is not None and time.monotonic() - stored_at > self.config.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, version, value):
+        with self._lock:
+            self._entries[key] = (value, version, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.config.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *args):
+        """
+        Drops every entry. Accepts and ignores the registry listener arguments.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.config.max_size,
+                "ttl_seconds": self.config.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
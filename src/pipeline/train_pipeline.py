@@ -0,0 +1,340 @@
+import argparse
+import ast
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, List
+
+import numpy as np
+
+from src.components.data_injection import DataIngestion, DataIngestionConfig
+from src.components.data_transformation import DataTransformation, DataTransformationConfig
+from src.components.model_leaderboard import ModelLeaderboardConfig
+from src.components.model_trainer import ModelTrainer, ModelTrainerConfig
+from src.components.prediction_table import PredictionTableBuilder, PredictionTableConfig
+from src.exception import CustomException
+from src.logger import logging
+
+
+@dataclass
+class TrainPipelineConfig:
+    state_file_path: str = os.path.join("artifacts", "pipeline_state.json")
+    train_array_path: str = os.path.join("artifacts", "train_array.npy")
+    test_array_path: str = os.path.join("artifacts", "test_array.npy")
+    # Stages run concurrently once their inputs are ready
+    max_workers: int = 2
+
+
+@dataclass
+class Stage:
+    """
+    One step of the training pipeline. `inputs` and `outputs` are file paths;
+    a stage depends on every stage producing one of its inputs. `params` is a
+    description of the configuration the stage runs with, fingerprinted along
+    with the input files.
+    """
+    name: str
+    inputs: List[str]
+    outputs: List[str]
+    run: Callable[[], object]
+    params: str = ""
+    depends_on: List[str] = field(default_factory=list)
+
+
+def file_fingerprint(path, block_size=1 << 20):
+    """
+    sha256 of a file's content, or None when it does not exist. A directory
+    (a columnar dataset) hashes the names and contents of its files.
+    """
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            digest.update(name.encode())
+            digest.update((file_fingerprint(os.path.join(path, name), block_size) or "").encode())
+        return digest.hexdigest()
+    with open(path, "rb") as file_obj:
+        for block in iter(lambda: file_obj.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _is_main_guard(node):
+    return (isinstance(node, ast.If) and isinstance(node.test, ast.Compare)
+            and isinstance(node.test.left, ast.Name) and node.test.left.id == "__name__")
+
+
+def _module_path(root, name):
+    base = os.path.join(root, *name.split("."))
+    for path in (f"{base}.py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _source_files(*objs):
+    """
+    Source files of the modules defining `objs` and of every src module they
+    import, directly or through other src modules (`__main__` blocks aside),
+    so that editing a shared helper such as src/utils.py reruns the stage.
+    """
+    # The directory holding the src package
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    pending = [os.path.abspath(sys.modules[obj.__module__].__file__) for obj in objs]
+    files = []
+    while pending:
+        path = pending.pop()
+        if path in files:
+            continue
+        files.append(path)
+        with open(path) as file_obj:
+            tree = ast.parse(file_obj.read(), path)
+        for statement in tree.body:
+            if _is_main_guard(statement):
+                continue
+            for node in ast.walk(statement):
+                if isinstance(node, ast.Import):
+                    names = [alias.name for alias in node.names]
+                elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                    names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+                else:
+                    continue
+                for name in names:
+                    module_path = _module_path(root, name) if name.split(".")[0] == "src" else None
+                    if module_path is not None:
+                        pending.append(module_path)
+    return sorted(os.path.relpath(path) for path in files)
+
+
+def _save_array(path, array):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp.npy"
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+
+class TrainPipeline:
+    """
+    Make-style runner for the training pipeline:
+
+        data/stud.csv -> ingestion -> data/train/test datasets
+                      -> transformation -> preprocessor.pkl + train/test arrays
+                      -> training -> model.pkl -> prediction_table
+
+    A directory or glob of CSV shards, or a SQLite database, can stand in for
+    data/stud.csv; every file of the source is an input of the ingestion
+    stage, so adding a shard reruns it.
+    Every stage also lists the source files of its component and of every src
+    module the component imports as inputs. A
+    stage is skipped when the fingerprints of its inputs and parameters match
+    the ones recorded in artifacts/pipeline_state.json after its last run and
+    its outputs are still on disk unchanged. Fingerprints are content hashes,
+    so when a stage reruns and reproduces byte-identical outputs, the stages
+    after it are still skipped. Stages whose dependencies are satisfied run
+    concurrently on `max_workers` threads.
+    """
+
+    def __init__(self, config: TrainPipelineConfig = None):
+        self.config = config or TrainPipelineConfig()
+        self.stages = self._build_stages()
+        self._state_lock = threading.Lock()
+
+    def _build_stages(self):
+        ingestion_config = DataIngestionConfig()
+        transformation_config = DataTransformationConfig()
+        trainer_config = ModelTrainerConfig()
+        table_config = PredictionTableConfig()
+
+        stages = [
+            Stage(
+                name="ingestion",
+                inputs=DataIngestion(ingestion_config).data_source().files() + _source_files(DataIngestion),
+                outputs=[ingestion_config.raw_data_path, ingestion_config.train_data_path,
+                         ingestion_config.test_data_path]
+                        + ([ingestion_config.raw_csv_path, ingestion_config.train_csv_path,
+                            ingestion_config.test_csv_path] if ingestion_config.export_csv else []),
+                run=self._run_ingestion,
+                params=repr(ingestion_config),
+            ),
+            Stage(
+                name="transformation",
+                inputs=[ingestion_config.train_data_path, ingestion_config.test_data_path,
+                        *_source_files(DataTransformation)],
+                outputs=[transformation_config.preprocessor_obj_path, self.config.train_array_path,
+                         self.config.test_array_path],
+                run=self._run_transformation,
+                params=repr(transformation_config),
+            ),
+            Stage(
+                name="training",
+                inputs=[self.config.train_array_path, self.config.test_array_path,
+                        trainer_config.preprocessor_file_path, *_source_files(ModelTrainer)],
+                outputs=[trainer_config.trained_model_file_path, trainer_config.manifest_file_path,
+                         ModelLeaderboardConfig().leaderboard_file_path],
+                run=self._run_training,
+                params=repr(trainer_config),
+            ),
+            Stage(
+                name="prediction_table",
+                inputs=[table_config.model_file_path, table_config.preprocessor_file_path,
+                        *_source_files(PredictionTableBuilder)],
+                outputs=[table_config.table_file_path, table_config.metadata_file_path],
+                run=self._run_prediction_table,
+                params=repr(table_config),
+            ),
+        ]
+
+        producers = {output: stage.name for stage in stages for output in stage.outputs}
+        for stage in stages:
+            stage.depends_on = sorted({producers[path] for path in stage.inputs if path in producers})
+        return {stage.name: stage for stage in stages}
+
+    def _run_ingestion(self):
+        return DataIngestion().initiate_data_ingestion()
+
+    def _run_transformation(self):
+        ingestion_config = DataIngestionConfig()
+        train_array, test_array, preprocessor_path = DataTransformation().initiate_data_transformation(
+            ingestion_config.train_data_path, ingestion_config.test_data_path
+        )
+        _save_array(self.config.train_array_path, train_array)
+        _save_array(self.config.test_array_path, test_array)
+        return preprocessor_path
+
+    def _run_training(self):
+        train_array = np.load(self.config.train_array_path, allow_pickle=False)
+        test_array = np.load(self.config.test_array_path, allow_pickle=False)
+        return ModelTrainer().initiate_model_trainer(train_array, test_array)
+
+    def _run_prediction_table(self):
+        return PredictionTableBuilder().initiate_prediction_table()
+
+    def _load_state(self):
+        if not os.path.exists(self.config.state_file_path):
+            return {}
+        with open(self.config.state_file_path) as file_obj:
+            return json.load(file_obj)
+
+    def _save_state(self, state):
+        os.makedirs(os.path.dirname(self.config.state_file_path), exist_ok=True)
+        tmp_path = f"{self.config.state_file_path}.tmp"
+        with open(tmp_path, "w") as file_obj:
+            json.dump(state, file_obj, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.config.state_file_path)
+
+    def _fingerprint(self, stage):
+        return {
+            "params": hashlib.sha256(stage.params.encode()).hexdigest(),
+            "inputs": {path: file_fingerprint(path) for path in stage.inputs},
+        }
+
+    def _is_up_to_date(self, stage, fingerprint, recorded):
+        if not recorded or recorded.get("params") != fingerprint["params"]:
+            return False
+        if recorded.get("inputs") != fingerprint["inputs"]:
+            return False
+        return all(file_fingerprint(path) == digest for path, digest in recorded.get("outputs", {}).items()) \
+            and set(recorded.get("outputs", {})) == set(stage.outputs)
+
+    def _execute(self, stage, state, force):
+        fingerprint = self._fingerprint(stage)
+        missing = [path for path, digest in fingerprint["inputs"].items() if digest is None]
+        if missing:
+            raise FileNotFoundError(f"Stage {stage.name} is missing its inputs {missing}")
+
+        if not force and self._is_up_to_date(stage, fingerprint, state.get(stage.name)):
+            logging.info(f"Stage {stage.name} is up to date, skipping it")
+            return "skipped", 0.0
+
+        logging.info(f"Running stage {stage.name}")
+        started = time.perf_counter()
+        stage.run()
+        elapsed = time.perf_counter() - started
+
+        with self._state_lock:
+            state[stage.name] = {
+                **fingerprint,
+                "outputs": {path: file_fingerprint(path) for path in stage.outputs},
+                "seconds": elapsed,
+                "finished_at": time.time(),
+            }
+            self._save_state(state)
+        logging.info(f"Stage {stage.name} finished in {elapsed:.2f}s")
+        return "ran", elapsed
+
+    def _selected(self, targets):
+        """
+        The target stages and everything upstream of them.
+        """
+        if not targets:
+            return set(self.stages)
+        unknown = set(targets) - set(self.stages)
+        if unknown:
+            raise ValueError(f"Unknown stages {sorted(unknown)}, expected some of {list(self.stages)}")
+        selected, pending = set(), list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in selected:
+                selected.add(name)
+                pending.extend(self.stages[name].depends_on)
+        return selected
+
+    def run(self, targets=None, force=False):
+        """
+        Brings the pipeline (or the given target stages) up to date.
+
+        Args:
+            targets (list, optional): Stage names to build, with their upstream stages.
+            force (bool): Rerun the selected stages even when they are up to date.
+
+        Returns:
+            dict: Stage name -> {"status": "ran" | "skipped", "seconds"}.
+        """
+        try:
+            selected = self._selected(targets)
+            state = self._load_state()
+            results = {}
+            with ThreadPoolExecutor(max_workers=max(1, self.config.max_workers)) as executor:
+                running = {}
+                while len(results) < len(selected):
+                    ready = [name for name in self.stages
+                             if name in selected and name not in results and name not in running.values()
+                             and all(dep in results or dep not in selected for dep in self.stages[name].depends_on)]
+                    for name in ready:
+                        running[executor.submit(self._execute, self.stages[name], state, force)] = name
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        status, seconds = future.result()
+                        results[name] = {"status": status, "seconds": seconds}
+
+            logging.info(f"Training pipeline finished: {results}")
+            return results
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the training pipeline, skipping up-to-date stages")
+    parser.add_argument("stages", nargs="*", help="Stages to build with their dependencies (default: all)")
+    parser.add_argument("--force", action="store_true", help="Rerun the selected stages even if up to date")
+    parser.add_argument("--workers", type=int, default=None, help="Stages run at the same time")
+
+    args = parser.parse_args(argv)
+    config = TrainPipelineConfig()
+    if args.workers is not None:
+        config.max_workers = args.workers
+    for name, result in TrainPipeline(config).run(args.stages, force=args.force).items():
+        print(f"{name}: {result['status']} ({result['seconds']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Schema registry for the student performance dataset.
+
+One declaration of every column's role and storage dtype, used wherever the
+project parses a CSV or builds a DataFrame: ingestion, transformation,
+the prediction table and serving. Text columns are pandas categoricals and
+scores are compact numbers (int8 target, float32 features), so pandas never
+re-infers object columns and large files take a fraction of the memory.
+
+The numeric features are handed to the preprocessor as float64
+(`model_input=True`): the scaler computes in its input dtype, and float64 is
+what the compiled preprocessor and fused linear scorer reproduce exactly.
+"""
+
+from dataclasses import dataclass
+
+import pandas as pd
+
+CATEGORICAL = "categorical"
+NUMERICAL = "numerical"
+TARGET = "target"
+
+# Dtype of the numeric features as the fitted preprocessor sees them.
+MODEL_INPUT_DTYPE = "float64"
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    name: str
+    role: str
+    dtype: str
+
+
+class Schema:
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self._by_name = {column.name: column for column in self.columns}
+
+    def _names(self, role):
+        return [column.name for column in self.columns if column.role == role]
+
+    @property
+    def names(self):
+        return [column.name for column in self.columns]
+
+    @property
+    def categorical_columns(self):
+        return self._names(CATEGORICAL)
+
+    @property
+    def numerical_columns(self):
+        return self._names(NUMERICAL)
+
+    @property
+    def feature_columns(self):
+        return [column.name for column in self.columns if column.role != TARGET]
+
+    @property
+    def target_column(self):
+        return self._names(TARGET)[0]
+
+    def dtypes(self, columns=None, model_input=False, categorize=True):
+        """
+        Column name -> pandas dtype for `columns` (default: all). With
+        `model_input` the numeric features use MODEL_INPUT_DTYPE; without
+        `categorize` the categorical columns are left out.
+        """
+        dtypes = {}
+        for name in columns or self.names:
+            column = self._by_name[name]
+            if column.role == CATEGORICAL and not categorize:
+                continue
+            dtypes[name] = MODEL_INPUT_DTYPE if model_input and column.role == NUMERICAL else column.dtype
+        return dtypes
+
+    def read_csv(self, source, columns=None, model_input=False, **kwargs):
+        """
+        pd.read_csv with the declared dtypes; `columns` limits the parsed
+        columns. Columns the schema does not know keep pandas' inference.
+        """
+        if columns is not None:
+            kwargs["usecols"] = list(columns)
+        names = kwargs.get("names") or columns or self.names
+        return pd.read_csv(source, dtype=self.dtypes([name for name in names if name in self._by_name],
+                                                     model_input), **kwargs)
+
+    def cast(self, frame, model_input=False, categorize=True):
+        """
+        Casts the schema columns present in `frame` to their declared dtypes.
+        """
+        dtypes = self.dtypes([name for name in frame.columns if name in self._by_name], model_input, categorize)
+        changed = {name: dtype for name, dtype in dtypes.items() if frame[name].dtype != dtype}
+        return frame.astype(changed) if changed else frame
+
+    def frame(self, data, columns=None, model_input=False, categorize=True):
+        """
+        Builds a DataFrame from a dict of columns (or records) with the schema
+        dtypes. Per-request serving frames pass `categorize=False`: building
+        categoricals costs a few milliseconds per call, which only pays off
+        for large frames, and every scoring path accepts plain strings.
+        """
+        return self.cast(pd.DataFrame(data, columns=columns), model_input, categorize)
+
+
+STUDENT_SCHEMA = Schema([
+    ColumnSpec("gender", CATEGORICAL, "category"),
+    ColumnSpec("race_ethnicity", CATEGORICAL, "category"),
+    ColumnSpec("parental_level_of_education", CATEGORICAL, "category"),
+    ColumnSpec("lunch", CATEGORICAL, "category"),
+    ColumnSpec("test_preparation_course", CATEGORICAL, "category"),
+    ColumnSpec("math_score", TARGET, "int8"),
+    ColumnSpec("reading_score", NUMERICAL, "float32"),
+    ColumnSpec("writing_score", NUMERICAL, "float32"),
+])
@@ -0,0 +1,142 @@
+"""
+Thread budget governor for training candidates concurrently.
+
+RandomForestRegressor (n_jobs), XGBRegressor (n_jobs/nthread) and
+CatBoostRegressor (thread_count) each start their own thread pools, and numpy
+BLAS / OpenMP add more on top. When several candidates train at once this
+oversubscribes the cores. The governor gives every candidate an explicit
+thread count, caps the native thread pools to it while the candidate fits,
+and only starts a candidate when its threads fit in what is left of the budget.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from threadpoolctl import threadpool_limits
+
+# Estimator parameters controlling the library's own thread pool, by preference.
+THREAD_PARAMS = ("n_jobs", "thread_count", "nthread")
+
+
+@dataclass
+class ThreadBudgetConfig:
+    # Total threads all concurrently training candidates may use (default: every core)
+    total_threads: int = None
+    # Upper bound for a single multi-threaded candidate (default: no bound)
+    max_threads_per_candidate: int = None
+
+
+def thread_param(model):
+    """
+    Name of the parameter that sets the estimator's thread count, or None for
+    single-threaded estimators.
+    """
+    params = model.get_params()
+    for name in THREAD_PARAMS:
+        if name in params:
+            return name
+    if type(model).__module__.startswith("catboost"):
+        # CatBoost only reports parameters that were set explicitly.
+        return "thread_count"
+    return None
+
+
+def set_model_threads(model, threads):
+    name = thread_param(model)
+    if name is not None:
+        model.set_params(**{name: threads})
+    return model
+
+
+@contextmanager
+def limit_native_threads(threads):
+    """
+    Caps the OpenMP and BLAS pools of the current process while fitting.
+    """
+    with threadpool_limits(limits=threads):
+        yield
+
+
+class ThreadBudget:
+    """
+    Assigns thread shares to candidates and tracks how well the budget is used:
+    the threads granted and the CPU time the fits really consumed.
+    """
+
+    def __init__(self, config: ThreadBudgetConfig = None):
+        self.config = config or ThreadBudgetConfig()
+        self.total_threads = max(1, self.config.total_threads or os.cpu_count() or 1)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._peak = 0
+        self._thread_seconds = 0.0
+        self._cpu_seconds = 0.0
+        self._started_at = None
+        self._finished_at = None
+
+    def allocate(self, models, n_jobs):
+        """
+        Returns name -> thread count. Single-threaded estimators get 1 thread;
+        multi-threaded ones split the budget evenly across the `n_jobs` slots.
+
+        Args:
+            models (dict): Name -> estimator.
+            n_jobs (int): Number of candidates trained at the same time.
+        """
+        slots = max(1, min(n_jobs, len(models)))
+        share = max(1, self.total_threads // slots)
+        if self.config.max_threads_per_candidate:
+            share = min(share, self.config.max_threads_per_candidate)
+        return {
+            name: share if thread_param(model) is not None else 1
+            for name, model in models.items()
+        }
+
+    def fits(self, threads):
+        with self._lock:
+            # A candidate larger than the whole budget may still run alone.
+            return self._in_use == 0 or self._in_use + threads <= self.total_threads
+
+    def acquire(self, threads):
+        with self._lock:
+            if self._started_at is None:
+                self._started_at = time.perf_counter()
+            self._in_use += threads
+            self._peak = max(self._peak, self._in_use)
+
+    def release(self, threads, elapsed, cpu_seconds=None):
+        """
+        Args:
+            threads (int): Threads the candidate held.
+            elapsed (float): Wall seconds it held them.
+            cpu_seconds (float, optional): CPU time its fit actually used
+                (user + system, measured in the fitting process).
+        """
+        with self._lock:
+            self._in_use -= threads
+            self._thread_seconds += threads * elapsed
+            self._cpu_seconds += cpu_seconds or 0.0
+            self._finished_at = time.perf_counter()
+
+    def report(self) -> dict:
+        """
+        `cpu_utilization` is the measured CPU time of the fits over the core
+        seconds the budget offered during the run; `granted_utilization` is
+        the thread-seconds handed out over the same, i.e. how full the budget
+        was kept, not how busy the cores were.
+        """
+        with self._lock:
+            wall = (self._finished_at - self._started_at) if self._started_at and self._finished_at else 0.0
+            offered = self.total_threads * wall
+            return {
+                "total_threads": self.total_threads,
+                "peak_threads": self._peak,
+                "wall_seconds": wall,
+                "thread_seconds": self._thread_seconds,
+                "cpu_seconds": self._cpu_seconds,
+                "granted_utilization": self._thread_seconds / offered if offered else 0.0,
+                "cpu_utilization": self._cpu_seconds / offered if offered else 0.0,
+            }
@@ -1,46 +1,291 @@
+import hashlib
+import json
 import os
 import pickle
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
 import dill
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 import numpy as np
-import pandas as pd
 from src.logger import logging
 from src.exception import CustomException
-from sklearn.metrics import r2_score,mean_absolute_error
+from src.thread_budget import ThreadBudget, limit_native_threads, set_model_threads
+from sklearn.metrics import r2_score
 
 def save_object(file_path, obj):
     try:
         dir_path = os.path.dirname(file_path)
         os.makedirs(dir_path, exist_ok=True)
 
-        with open(file_path, 'wb') as file_obj:
+        # Write next to the target and swap it in, so a reader (the serving
+        # model registry) never sees a half written pickle.
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, 'wb') as file_obj:
             dill.dump(obj, file_obj)
+        os.replace(tmp_path, file_path)
             
     except Exception as e:
         error_msg = CustomException.error_message_detail(str(e))
         logging.info(error_msg)  # Log error messages with a higher severity level (error)
         raise CustomException(error_msg)  # Re-raise the custom exception for clearer error handling
     
-def evaluate_models(X_train, y_train,X_test,y_test,models):
+_worker_arrays = {}
+
+
+def _share_arrays(arrays):
+    """
+    Copies each array into a shared memory block once; workers map the blocks
+    instead of receiving a pickled copy per task.
+    """
+    blocks, descriptors = [], {}
+    for key, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        descriptors[key] = (block.name, array.shape, array.dtype.str)
+    return blocks, descriptors
+
+
+def _attach_shared_array(name, shape, dtype):
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _init_evaluate_worker(descriptors):
+    for key, (name, shape, dtype) in descriptors.items():
+        _worker_arrays[key] = _attach_shared_array(name, shape, dtype)
+
+
+EVALUATION_MODES = ("fast", "diagnostics")
+
+
+def iterations_used(model):
+    """
+    Boosting rounds a fitted model kept (after early stopping), or None for
+    estimators that are not iterative.
+    """
+    best_iteration = getattr(model, "best_iteration", None)  # xgboost with early stopping
+    if best_iteration is not None:
+        return int(best_iteration) + 1
+    if hasattr(model, "tree_count_"):  # catboost, shrunk to the best iteration
+        return int(model.tree_count_)
+    if hasattr(model, "n_estimators_"):  # sklearn gradient boosting
+        return int(model.n_estimators_)
+    if hasattr(model, "get_booster"):  # xgboost without early stopping
+        return int(model.get_booster().num_boosted_rounds())
+    return None
+
+
+def _status_bytes(field):
+    """
+    A memory field (VmRSS, VmHWM) of /proc/self/status in bytes, or None
+    where /proc is not available.
+    """
+    try:
+        with open("/proc/self/status") as file_obj:
+            for line in file_obj:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _start_rss_peak():
+    """
+    Resets the process's peak RSS (Linux: clear_refs) and returns the baseline
+    the fit's peak is measured from.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as file_obj:
+            file_obj.write("5")
+        return "proc", _status_bytes("VmRSS")
+    except OSError:
+        pass
+    if resource is not None:
+        # Only the growth of the lifetime peak is visible here.
+        return "rusage", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return None, None
+
+
+def _rss_peak_mb(mode, baseline):
+    """
+    Resident memory the fit added at its peak, native allocations included.
+    """
+    if mode == "proc":
+        peak = _status_bytes("VmHWM")
+        return None if peak is None or baseline is None else max(0, peak - baseline) / 2 ** 20
+    if mode == "rusage":
+        grown = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        return max(0, grown) / (2 ** 20 if sys.platform == "darwin" else 2 ** 10)
+    return None
+
+
+def _fit_and_score(model, threads, X_train, y_train, X_test, y_test, X_sample=None, y_sample=None,
+                   fit_params=None):
+    """
+    Fits one candidate under its thread share and returns its test R2 with
+    the fit's wall and CPU time and the peak resident memory it added to the fitting
+    process (native allocations of xgboost/CatBoost included).
+    When a training sample is given its R2 is added for overfitting checks.
+    """
+    set_model_threads(model, threads)
+    with limit_native_threads(threads):
+        rss_mode, rss_baseline = _start_rss_peak()
+        cpu_started = time.process_time()  # user + system time of every thread of this process
+        started = time.perf_counter()
+        model.fit(X_train, y_train, **(fit_params or {}))  # Train model
+        fit_seconds = time.perf_counter() - started
+        cpu_seconds = time.process_time() - cpu_started
+        peak_memory_mb = _rss_peak_mb(rss_mode, rss_baseline)
+
+        y_test_pred = model.predict(X_test)
+        y_sample_pred = model.predict(X_sample) if X_sample is not None else None
+
+    test_model_score = r2_score(y_test, y_test_pred)
+    detail = {"fit_seconds": fit_seconds, "cpu_seconds": cpu_seconds, "peak_memory_mb": peak_memory_mb,
+              "iterations": iterations_used(model)}
+    if y_sample_pred is not None:
+        detail["train_sample_r2"] = r2_score(y_sample, y_sample_pred)
+        detail["overfit_gap"] = detail["train_sample_r2"] - test_model_score
+    return test_model_score, detail
+
+
+def _fit_candidate(name, model, threads, fit_params):
+    arrays = {key: array for key, (_, array) in _worker_arrays.items()}
+    started = time.perf_counter()
+    test_model_score, detail = _fit_and_score(
+        model, threads, arrays["X_train"], arrays["y_train"], arrays["X_test"], arrays["y_test"],
+        arrays.get("X_sample"), arrays.get("y_sample"), fit_params,
+    )
+    return name, test_model_score, detail, model, time.perf_counter() - started
+
+
+def evaluate_models(X_train, y_train,X_test,y_test,models,n_jobs=1,thread_budget=None,details=None,
+                    mode="fast",diagnostics_sample_size=1000,random_state=42,fit_params=None,cache=None):
+    """
+    Fits every candidate and scores it with R2 on the test set.
+
+    Args:
+        models (dict): Name -> unfitted estimator. Entries are replaced by the
+            fitted estimators, in the original order.
+        n_jobs (int): Worker processes training candidates concurrently;
+            1 trains in this process, -1 uses every core.
+        thread_budget (ThreadBudget, optional): Governs the threads given to
+            each candidate; defaults to one core per thread for the machine.
+        details (dict, optional): Filled with name -> {"fit_seconds", "cpu_seconds",
+            "peak_memory_mb", "iterations"} for every candidate, plus
+            "train_sample_r2" and "overfit_gap" in diagnostics mode.
+        mode (str): "fast" never predicts on the training set; "diagnostics"
+            also scores a random sample of `diagnostics_sample_size` training
+            rows to check for overfitting without a full extra pass.
+        fit_params (dict, optional): Name -> extra keyword arguments for that
+            candidate's fit, e.g. an early stopping eval_set.
+        cache (TrainingCache, optional): Candidates found in the cache are
+            loaded instead of refitted, and fresh fits are stored in it.
+
+    Returns:
+        dict: Name -> test R2, in the order of `models`.
+    """
     try:
         report = {}
+        details = {} if details is None else details
+        fit_params = fit_params or {}
+        thread_budget = thread_budget or ThreadBudget()
+        if n_jobs is not None and n_jobs < 0:
+            n_jobs = os.cpu_count()
+        n_jobs = max(1, min(n_jobs or 1, len(models)))
+        threads = thread_budget.allocate(models, n_jobs)
 
-        for i in range(len(list(models))):
-            model = list(models.values())[i]
-           
-            model.fit(X_train, y_train)  # Train model
+        if mode not in EVALUATION_MODES:
+            raise ValueError(f"Unknown evaluation mode {mode!r}, expected one of {EVALUATION_MODES}")
+        X_sample = y_sample = None
+        if mode == "diagnostics":
+            rng = np.random.default_rng(random_state)
+            sample_size = min(diagnostics_sample_size, len(X_train))
+            sample = np.sort(rng.choice(len(X_train), size=sample_size, replace=False))
+            X_sample, y_sample = X_train[sample], y_train[sample]
 
-            y_train_pred = model.predict(X_train)
+        results, keys = {}, {}
+        if cache is not None:
+            data_digest = cache.data_digest(X_train, y_train, X_test, y_test, X_sample, y_sample)
+            settings = {"mode": mode, "diagnostics_sample_size": diagnostics_sample_size, "random_state": random_state,
+                        "peak_memory": "rss"}
+            for name, model in models.items():
+                keys[name] = cache.key(data_digest, model, fit_params.get(name), settings)
+                hit = cache.get(keys[name])
+                if hit is not None:
+                    fitted_model, test_model_score, detail = hit
+                    results[name] = (test_model_score, detail, fitted_model)
+            if results:
+                logging.info(f"Training cache hits, not refitted: {list(results)}")
+        to_fit = {name: model for name, model in models.items() if name not in results}
 
-            y_test_pred = model.predict(X_test)
+        if n_jobs == 1 or len(to_fit) <= 1:
+            for name, model in to_fit.items():
+                thread_budget.acquire(threads[name])
+                started = time.perf_counter()
+                test_model_score, detail = _fit_and_score(model, threads[name], X_train, y_train, X_test, y_test,
+                                                          X_sample, y_sample, fit_params.get(name))
+                thread_budget.release(threads[name], time.perf_counter() - started, detail["cpu_seconds"])
+                results[name] = (test_model_score, detail, model)
+        else:
+            shared = {"X_train": X_train, "y_train": y_train, "X_test": X_test, "y_test": y_test}
+            if X_sample is not None:
+                shared.update(X_sample=X_sample, y_sample=y_sample)
+            blocks, descriptors = _share_arrays(shared)
+            try:
+                with ProcessPoolExecutor(max_workers=n_jobs,
+                                         initializer=_init_evaluate_worker,
+                                         initargs=(descriptors,)) as executor:
+                    pending = list(to_fit.items())
+                    running = {}
+                    while pending or running:
+                        # Start the first waiting candidate whose threads fit in the budget.
+                        launch = next(
+                            (i for i, (name, _) in enumerate(pending)
+                             if len(running) < n_jobs and thread_budget.fits(threads[name])),
+                            None,
+                        )
+                        if launch is not None:
+                            name, model = pending.pop(launch)
+                            thread_budget.acquire(threads[name])
+                            running[executor.submit(_fit_candidate, name, model, threads[name],
+                                                    fit_params.get(name))] = name
+                            continue
 
-            train_model_score = r2_score(y_train, y_train_pred)
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            name = running.pop(future)
+                            _, test_model_score, detail, fitted_model, elapsed = future.result()
+                            thread_budget.release(threads[name], elapsed, detail["cpu_seconds"])
+                            results[name] = (test_model_score, detail, fitted_model)
+            finally:
+                for block in blocks:
+                    block.close()
+                    block.unlink()
 
-            test_model_score = r2_score(y_test, y_test_pred)
+        if cache is not None:
+            for name in to_fit:
+                test_model_score, detail, fitted_model = results[name]
+                cache.put(keys[name], fitted_model, test_model_score, detail)
+            logging.info(f"Training cache: {cache.stats()}")
 
-            report[list(models.keys())[i]] = test_model_score
+        # Report in the order of `models` whichever worker finished first.
+        for name in list(models):
+            report[name], details[name], models[name] = results[name]
 
+        logging.info(f"Candidate training thread budget usage: {thread_budget.report()}")
         return report
 
     except Exception as e:
@@ -52,4 +297,42 @@ def load_object(file_path):
             return pickle.load(file_obj)
 
     except Exception as e:
-        raise CustomException(e, sys)
\ No newline at end of file
+        raise CustomException(e, sys)
+
+def artifacts_version(*payloads):
+    """
+    Short content checksum identifying a set of artifact files (given as bytes).
+    """
+    checksum = hashlib.sha256()
+    for payload in payloads:
+        checksum.update(payload)
+    return checksum.hexdigest()[:16]
+
+
+def write_artifacts_manifest(manifest_path, **file_paths):
+    """
+    Records the SHA-256 of each named artifact file in a JSON manifest.
+
+    The trainer writes it after the model, so its presence means the files it
+    names form a complete pair; readers compare the checksums before using them.
+    """
+    files = {}
+    for name, path in file_paths.items():
+        with open(path, "rb") as file_obj:
+            files[name] = {"path": path, "sha256": hashlib.sha256(file_obj.read()).hexdigest()}
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w") as file_obj:
+        json.dump({"files": files}, file_obj, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def read_artifacts_manifest(manifest_path):
+    """
+    Returns {name: sha256} from a manifest written by `write_artifacts_manifest`, or None without one.
+    """
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as file_obj:
+        manifest = json.load(file_obj)
+    return {name: entry["sha256"] for name, entry in manifest["files"].items()}
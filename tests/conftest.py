@@ -0,0 +1,34 @@
+import os
+
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.components.data_transformation import DataTransformation
+from src.schema import STUDENT_SCHEMA
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "stud.csv")
+
+
+@pytest.fixture(scope="session")
+def student_csv():
+    return DATA_PATH
+
+
+@pytest.fixture(scope="session")
+def student_frame(student_csv):
+    return STUDENT_SCHEMA.read_csv(student_csv)
+
+
+@pytest.fixture(scope="session")
+def features(student_frame):
+    return STUDENT_SCHEMA.cast(student_frame[STUDENT_SCHEMA.feature_columns], model_input=True)
+
+
+@pytest.fixture(scope="session")
+def fitted_pair(student_frame, features):
+    """
+    The project's preprocessor and a LinearRegression fitted on the student dataset.
+    """
+    preprocessor = DataTransformation().get_transformer_object().fit(features)
+    model = LinearRegression().fit(preprocessor.transform(features), student_frame[STUDENT_SCHEMA.target_column])
+    return preprocessor, model
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+
+from src.pipeline.compiled_preprocessor import CompiledPreprocessor, compile_preprocessor
+from src.schema import STUDENT_SCHEMA
+
+
+def _records(frame):
+    return frame.astype(object).to_dict("records")
+
+
+def test_matches_sklearn_transform(fitted_pair, features):
+    preprocessor = fitted_pair[0]
+    compiled = CompiledPreprocessor.from_column_transformer(preprocessor)
+    expected = preprocessor.transform(features)
+
+    assert compiled.n_features == expected.shape[1]
+    assert compiled.input_columns == STUDENT_SCHEMA.feature_columns
+    np.testing.assert_array_equal(compiled.transform_records(_records(features)), expected)
+    record = _records(features.iloc[[7]])[0]
+    np.testing.assert_array_equal(compiled.transform_record(record), expected[7])
+    np.testing.assert_array_equal(compiled.transform_record(tuple(record.values())), expected[7])
+
+
+def test_missing_values_are_imputed_like_sklearn(fitted_pair, features):
+    preprocessor = fitted_pair[0]
+    compiled = CompiledPreprocessor.from_column_transformer(preprocessor)
+    frame = features.iloc[:2].astype(object)
+    frame.loc[frame.index[0], "gender"] = np.nan
+    frame.loc[frame.index[1], "reading_score"] = np.nan
+
+    expected = preprocessor.transform(frame)
+    records = _records(frame)
+    records[0]["gender"] = None
+    np.testing.assert_array_equal(compiled.transform_records(records), expected)
+
+
+def test_unknown_categories(fitted_pair, features):
+    record = _records(features.iloc[[0]])[0] | {"lunch": "caviar"}
+
+    compiled = CompiledPreprocessor.from_column_transformer(fitted_pair[0])
+    with pytest.raises(ValueError):
+        compiled.transform_record(record)
+
+    ignoring = clone(fitted_pair[0]).set_params(cat_pipeline__one_hot_encoder__handle_unknown="ignore")
+    ignoring.fit(features)
+    expected = ignoring.transform(pd.DataFrame([record]))[0]
+    np.testing.assert_array_equal(
+        CompiledPreprocessor.from_column_transformer(ignoring).transform_record(record), expected)
+
+
+@pytest.mark.parametrize("settings", [{"min_frequency": 100}, {"max_categories": 3}])
+def test_infrequent_categories_are_not_compiled(fitted_pair, features, settings):
+    preprocessor = clone(fitted_pair[0]).set_params(
+        **{f"cat_pipeline__one_hot_encoder__{key}": value for key, value in settings.items()})
+    preprocessor.fit(features)
+
+    with pytest.raises(ValueError, match="infrequent"):
+        CompiledPreprocessor.from_column_transformer(preprocessor)
+    assert compile_preprocessor(preprocessor) is None
+
+
+def test_passthrough_columns(features):
+    preprocessor = ColumnTransformer([
+        ("scores", "passthrough", STUDENT_SCHEMA.numerical_columns),
+        ("other", "drop", STUDENT_SCHEMA.categorical_columns),
+    ]).fit(features)
+    compiled = CompiledPreprocessor.from_column_transformer(preprocessor)
+
+    np.testing.assert_array_equal(compiled.transform_records(_records(features)),
+                                  preprocessor.transform(features))
@@ -0,0 +1,118 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.data_injection import DataIngestion, DataIngestionConfig, hash_split_mask
+from src.components.frame_store import read_table
+from src.schema import STUDENT_SCHEMA
+
+
+def _config(tmp_path, source, **settings):
+    artifacts = tmp_path / "artifacts"
+    return DataIngestionConfig(
+        source_data_path=str(source),
+        chunk_size=128,
+        ingestion_state_path=str(artifacts / "ingestion_state.json"),
+        train_data_path=str(artifacts / "train"),
+        test_data_path=str(artifacts / "test"),
+        raw_data_path=str(artifacts / "data"),
+        **settings,
+    )
+
+
+def _read(config):
+    return (read_table(config.train_data_path, schema=STUDENT_SCHEMA),
+            read_table(config.test_data_path, schema=STUDENT_SCHEMA))
+
+
+def _sorted(frame):
+    return frame.astype(str).sort_values(list(frame.columns)).reset_index(drop=True)
+
+
+def test_hash_split_is_independent_of_chunking_and_order(student_frame):
+    mask = hash_split_mask(student_frame, 0.33)
+    assert 0.28 < mask.mean() < 0.38
+
+    chunked = np.concatenate([hash_split_mask(student_frame.iloc[start:start + 97], 0.33)
+                              for start in range(0, len(student_frame), 97)])
+    np.testing.assert_array_equal(chunked, mask)
+
+    order = np.random.default_rng(0).permutation(len(student_frame))
+    np.testing.assert_array_equal(hash_split_mask(student_frame.iloc[order], 0.33), mask[order])
+
+    # Scores parsed as int or float, text as str or category, hash alike.
+    retyped = student_frame.astype({"reading_score": "int64", "gender": "object"})
+    np.testing.assert_array_equal(hash_split_mask(retyped, 0.33), mask)
+
+
+def test_hash_split_on_key_columns(student_frame):
+    keys = ["gender", "lunch"]
+    mask = hash_split_mask(student_frame, 0.5, key_columns=keys)
+    # Rows with the same key always land on the same side.
+    assert student_frame.assign(test=mask).groupby(keys, observed=True)["test"].nunique().max() == 1
+
+
+def test_appended_rows_never_move_earlier_rows(tmp_path, student_csv):
+    lines = open(student_csv).read().splitlines(keepends=True)
+    source = tmp_path / "students.csv"
+    source.write_text("".join(lines[:601]))
+    config = _config(tmp_path, source, ingestion_mode="incremental")
+
+    DataIngestion(config).initiate_data_ingestion()
+    first_train, first_test = _read(config)
+    assert len(first_train) + len(first_test) == 600
+
+    with open(source, "a") as file_obj:
+        file_obj.write("".join(lines[601:]))
+    DataIngestion(config).initiate_data_ingestion()
+    train, test = _read(config)
+
+    # Earlier rows keep their side: both datasets only grew at the end.
+    pd.testing.assert_frame_equal(train.iloc[:len(first_train)], first_train)
+    pd.testing.assert_frame_equal(test.iloc[:len(first_test)], first_test)
+    with open(config.ingestion_state_path) as file_obj:
+        state = json.load(file_obj)
+    assert state["byte_offset"] == source.stat().st_size
+    assert state["rows"] == {"raw": 1000, "train": len(train), "test": len(test)}
+
+    # Same split as ingesting the whole file in one go.
+    full_config = _config(tmp_path / "full", student_csv, ingestion_mode="streaming")
+    DataIngestion(full_config).initiate_data_ingestion()
+    full_train, full_test = _read(full_config)
+    pd.testing.assert_frame_equal(_sorted(train), _sorted(full_train))
+    pd.testing.assert_frame_equal(_sorted(test), _sorted(full_test))
+
+
+def test_edited_source_is_rebuilt(tmp_path, student_csv):
+    lines = open(student_csv).read().splitlines(keepends=True)
+    source = tmp_path / "students.csv"
+    source.write_text("".join(lines[:301]))
+    config = _config(tmp_path, source, ingestion_mode="incremental")
+    DataIngestion(config).initiate_data_ingestion()
+
+    # Rewrite an already ingested row: appending would keep the stale copy.
+    source.write_text("".join([lines[0]] + lines[2:302]))
+    DataIngestion(config).initiate_data_ingestion()
+    train, test = _read(config)
+    assert len(train) + len(test) == 300
+
+    expected = STUDENT_SCHEMA.read_csv(source)
+    mask = hash_split_mask(expected, config.test_size)
+    pd.testing.assert_frame_equal(_sorted(test), _sorted(expected[mask]))
+
+
+@pytest.mark.parametrize("settings", [{"test_size": 0.5}, {"split_key_columns": ("reading_score", "writing_score")}])
+def test_changed_split_settings_rebuild(tmp_path, student_csv, settings):
+    lines = open(student_csv).read().splitlines(keepends=True)
+    source = tmp_path / "students.csv"
+    source.write_text("".join(lines[:301]))
+    DataIngestion(_config(tmp_path, source, ingestion_mode="incremental")).initiate_data_ingestion()
+
+    config = _config(tmp_path, source, ingestion_mode="incremental", **settings)
+    DataIngestion(config).initiate_data_ingestion()
+    _, test = _read(config)
+    expected = STUDENT_SCHEMA.read_csv(source)
+    mask = hash_split_mask(expected, config.test_size, config.split_key_columns)
+    pd.testing.assert_frame_equal(_sorted(test), _sorted(expected[mask]))
@@ -0,0 +1,83 @@
+import json
+
+import numpy as np
+from sklearn.tree import DecisionTreeRegressor
+
+from src.components import hyperparameter_search
+from src.components.hyperparameter_search import (
+    HyperparameterSearch,
+    HyperparameterSearchConfig,
+    IntRange,
+    TrialStore,
+)
+
+
+def _data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3))
+    y = X @ np.array([1.0, -2.0, 0.5]) + rng.normal(scale=0.1, size=200)
+    return X[:150], y[:150], X[150:], y[150:]
+
+
+def test_grid_search_resumes_until_the_grid_is_exhausted(tmp_path, monkeypatch):
+    # 5 x 5 = 25 grid points, one new trial per run: the last runs have to
+    # skip more seen points than a proposal round draws.
+    monkeypatch.setitem(hyperparameter_search.SEARCH_SPACES, "Decision Tree",
+                        {"max_depth": [2, 3, 4, 5, 6], "min_samples_leaf": IntRange(1, 5)})
+    config = HyperparameterSearchConfig(trials=1, sampler="grid", grid_size=5,
+                                        storage_path=str(tmp_path / "trials.db"))
+    X_train, y_train, X_eval, y_eval = _data()
+    models = {"Decision Tree": DecisionTreeRegressor(random_state=0)}
+
+    runs = []
+    for _ in range(26):
+        HyperparameterSearch(config).run(models, X_train, y_train, X_eval, y_eval)
+        store = TrialStore(config.storage_path)
+        try:
+            rows = store._connection.execute("SELECT params, status FROM trials").fetchall()
+        finally:
+            store.close()
+        runs.append(len(rows))
+
+    assert runs == list(range(1, 26)) + [25]
+    assert {json.dumps(json.loads(params), sort_keys=True) for params, _ in rows} == {
+        json.dumps({"max_depth": depth, "min_samples_leaf": leaf}, sort_keys=True)
+        for depth in (2, 3, 4, 5, 6) for leaf in (1, 2, 3, 4, 5)
+    }
+    assert {status for _, status in rows} == {"complete"}
+
+
+def test_trial_store_claims_each_parameter_set_once(tmp_path):
+    path = str(tmp_path / "trials.db")
+    first, second = TrialStore(path), TrialStore(path)
+    second.worker = "other-host:1"
+    params = {"max_depth": 4, "learning_rate": 0.1}
+    try:
+        assert first.reserve("study", "data", "xgboost", params) is True
+        # The same set, in another key order, by the same or another worker.
+        assert first.reserve("study", "data", "xgboost", {"learning_rate": 0.1, "max_depth": 4}) is False
+        assert second.reserve("study", "data", "xgboost", params) is False
+        # Other data or another family is a different trial.
+        assert second.reserve("study", "other-data", "xgboost", params) is True
+        assert second.reserve("study", "data", "Gradient Boosting", params) is True
+
+        first.finish("study", "data", "xgboost", params, score=0.8, fit_seconds=1.0)
+        assert second.reserve("study", "data", "xgboost", params) is False
+        assert second.history("study", "data", "xgboost") == [(params, 0.8)]
+    finally:
+        first.close()
+        second.close()
+
+
+def test_trial_store_takes_over_stale_claims(tmp_path):
+    path = str(tmp_path / "trials.db")
+    first, second = TrialStore(path), TrialStore(path, stale_after_seconds=0.0)
+    second.worker = "other-host:1"
+    params = {"max_depth": 4}
+    try:
+        assert first.reserve("study", "data", "xgboost", params) is True
+        # The first worker died mid-trial; with no grace period the claim is stale.
+        assert second.reserve("study", "data", "xgboost", params) is True
+    finally:
+        first.close()
+        second.close()
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from sklearn.base import clone
+from sklearn.linear_model import Ridge
+from sklearn.tree import DecisionTreeRegressor
+
+from src.pipeline.compiled_preprocessor import CompiledPreprocessor
+from src.pipeline.linear_scorer import FusedLinearScorer, build_linear_scorer
+
+
+def _scorer(preprocessor, model):
+    return FusedLinearScorer.from_fitted(CompiledPreprocessor.from_column_transformer(preprocessor), model)
+
+
+def test_matches_model_predict(fitted_pair, features):
+    preprocessor, model = fitted_pair
+    scorer = _scorer(preprocessor, model)
+    expected = model.predict(preprocessor.transform(features))
+
+    np.testing.assert_allclose(scorer.score_frame(features), expected, rtol=1e-10, atol=1e-9)
+    records = features.astype(object).to_dict("records")
+    np.testing.assert_allclose([scorer.score_record(record) for record in records], expected,
+                               rtol=1e-10, atol=1e-9)
+
+
+def test_missing_values_and_unknown_categories(fitted_pair, student_frame, features):
+    frame = features.iloc[:3].astype(object)
+    frame.loc[frame.index[0], "parental_level_of_education"] = np.nan
+    frame.loc[frame.index[1], "writing_score"] = np.nan
+    frame.loc[frame.index[2], "race_ethnicity"] = "group Z"
+
+    preprocessor, model = fitted_pair
+    scorer = _scorer(preprocessor, model)
+    with pytest.raises(ValueError):
+        scorer.score_frame(frame)
+    with pytest.raises(ValueError):
+        scorer.score_record(frame.to_dict("records")[2])
+
+    # An encoder that ignores unknown categories scores them as all-zero columns.
+    preprocessor = clone(preprocessor).set_params(cat_pipeline__one_hot_encoder__handle_unknown="ignore")
+    preprocessor.fit(features)
+    model = Ridge(alpha=1.0).fit(preprocessor.transform(features), student_frame["math_score"])
+    scorer = _scorer(preprocessor, model)
+    expected = model.predict(preprocessor.transform(frame))
+    np.testing.assert_allclose(scorer.score_frame(frame), expected, rtol=1e-10, atol=1e-9)
+    np.testing.assert_allclose([scorer.score_record(record) for record in frame.to_dict("records")],
+                               expected, rtol=1e-10, atol=1e-9)
+
+
+def test_only_linear_models_are_fused(fitted_pair, student_frame, features):
+    preprocessor = fitted_pair[0]
+    compiled = CompiledPreprocessor.from_column_transformer(preprocessor)
+    tree = DecisionTreeRegressor(max_depth=3).fit(preprocessor.transform(features), student_frame["math_score"])
+
+    assert build_linear_scorer(compiled, tree) is None
+    assert build_linear_scorer(None, fitted_pair[1]) is None
+    assert isinstance(build_linear_scorer(compiled, fitted_pair[1]), FusedLinearScorer)
@@ -0,0 +1,53 @@
+import sys
+
+import pandas as pd
+import pytest
+
+from src.exception import CustomException
+from src.pipeline.micro_batcher import MicroBatcher, MicroBatcherConfig
+
+
+def _predict_fn(features):
+    # Fails like PredictPipeline.predict does: a CustomException wrapping the error.
+    try:
+        if (features["gender"] == "alien").any():
+            raise ValueError("unknown category 'alien'")
+        return features["reading_score"].to_numpy() * 2
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def _row(gender, score):
+    return pd.DataFrame({"gender": [gender], "reading_score": [score]})
+
+
+def test_failed_batch_does_not_hang_callers():
+    # Wide window so the bad row lands in the same batch as the good ones.
+    batcher = MicroBatcher(_predict_fn, MicroBatcherConfig(max_batch_size=4, max_wait_ms=200))
+    try:
+        futures = [batcher.submit(_row(gender, score))
+                   for gender, score in [("male", 1.0), ("alien", 2.0), ("female", 3.0), ("male", 4.0)]]
+
+        assert futures[0].result(timeout=5).tolist() == [2.0]
+        with pytest.raises(CustomException):
+            futures[1].result(timeout=5)
+        assert futures[2].result(timeout=5).tolist() == [6.0]
+        assert futures[3].result(timeout=5).tolist() == [8.0]
+
+        # The worker survived and keeps serving.
+        assert batcher.submit(_row("female", 5.0)).result(timeout=5).tolist() == [10.0]
+        assert batcher._worker.is_alive()
+    finally:
+        batcher.close()
+
+
+def test_worker_survives_errors_outside_the_predict_call():
+    batcher = MicroBatcher(lambda features: features["reading_score"].to_numpy(),
+                           MicroBatcherConfig(max_wait_ms=1))
+    try:
+        with pytest.raises(Exception):
+            # Not a DataFrame: collecting the batch fails before scoring.
+            batcher.submit(object()).result(timeout=5)
+        assert batcher.submit(_row("male", 7.0)).result(timeout=5).tolist() == [7.0]
+    finally:
+        batcher.close()
@@ -0,0 +1,113 @@
+import os
+
+import pytest
+from sklearn.base import clone
+from sklearn.linear_model import LinearRegression
+
+from src.exception import CustomException
+from src.pipeline.model_registry import ModelRegistry, ModelRegistryConfig
+from src.utils import save_object, write_artifacts_manifest
+
+
+def _config(tmp_path):
+    return ModelRegistryConfig(
+        model_path=str(tmp_path / "model.pkl"),
+        preprocessor_path=str(tmp_path / "preprocessor.pkl"),
+        manifest_path=str(tmp_path / "manifest.json"),
+        use_prediction_table=False,
+        load_timeout=0.5,
+    )
+
+
+def _publish(config, preprocessor, model):
+    # The order a training run writes them in: preprocessor, model, manifest.
+    save_object(config.preprocessor_path, preprocessor)
+    save_object(config.model_path, model)
+    write_artifacts_manifest(config.manifest_path, model=config.model_path,
+                             preprocessor=config.preprocessor_path)
+
+
+def _bump_mtime(path):
+    # Some filesystems keep mtime at a coarse resolution; make the change visible.
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def narrow_pair(fitted_pair, student_frame, features):
+    # A retrained pair whose preprocessor outputs fewer columns.
+    preprocessor = clone(fitted_pair[0]).set_params(cat_pipeline__one_hot_encoder__drop="first").fit(features)
+    model = LinearRegression().fit(preprocessor.transform(features), student_frame["math_score"])
+    return preprocessor, model
+
+
+def test_reload_swaps_in_a_new_version(tmp_path, fitted_pair, narrow_pair):
+    config = _config(tmp_path)
+    _publish(config, *fitted_pair)
+    registry = ModelRegistry(config)
+    first = registry.get()
+    assert registry.refresh() is False
+
+    _publish(config, *narrow_pair)
+    _bump_mtime(config.manifest_path)
+    assert registry.refresh() is True
+    assert registry.get().version != first.version
+    assert registry.get().model.n_features_in_ == narrow_pair[1].n_features_in_
+
+
+def test_mismatched_pair_is_not_published(tmp_path, fitted_pair, narrow_pair):
+    config = _config(tmp_path)
+    _publish(config, *fitted_pair)
+    registry = ModelRegistry(config)
+    version = registry.get().version
+
+    # A new run has written its preprocessor but not yet its model and manifest.
+    save_object(config.preprocessor_path, narrow_pair[0])
+    assert registry.refresh() is False
+    _bump_mtime(config.manifest_path)
+    assert registry.refresh() is False
+    assert registry.get().version == version
+
+    # Once the model and the manifest land, the new pair is published.
+    save_object(config.model_path, narrow_pair[1])
+    write_artifacts_manifest(config.manifest_path, model=config.model_path,
+                             preprocessor=config.preprocessor_path)
+    _bump_mtime(config.manifest_path)
+    assert registry.refresh() is True
+    assert registry.get().version != version
+
+
+def test_without_manifest_width_mismatch_is_not_published(tmp_path, fitted_pair, narrow_pair):
+    config = _config(tmp_path)
+    save_object(config.preprocessor_path, fitted_pair[0])
+    save_object(config.model_path, fitted_pair[1])
+    registry = ModelRegistry(config)
+    version = registry.get().version
+
+    save_object(config.model_path, narrow_pair[1])
+    _bump_mtime(config.model_path)
+    assert registry.refresh() is False
+    assert registry.get().version == version
+
+    save_object(config.preprocessor_path, narrow_pair[0])
+    _bump_mtime(config.model_path)
+    assert registry.refresh() is True
+
+
+def test_first_load_waits_for_a_consistent_pair(tmp_path, fitted_pair, narrow_pair):
+    config = _config(tmp_path)
+    _publish(config, *fitted_pair)
+    save_object(config.preprocessor_path, narrow_pair[0])
+    with pytest.raises(CustomException) as excinfo:
+        ModelRegistry(config).get()
+    assert "No consistent" in repr(excinfo.value.error_message)
+
+
+def test_files_changing_during_the_read_are_retried(tmp_path, fitted_pair, monkeypatch):
+    config = _config(tmp_path)
+    _publish(config, *fitted_pair)
+    registry = ModelRegistry(config)
+    stamps = iter([("a",), ("b",)])
+    monkeypatch.setattr(registry, "_read_stamps", lambda: next(stamps))
+    assert registry._load() is False
+    assert registry._artifacts is None
@@ -0,0 +1,22 @@
+import pickle
+
+import numpy as np
+from sklearn.ensemble import GradientBoostingRegressor
+
+from src.components.model_trainer import ValidationMonitor, _refit_params
+
+
+def test_gradient_boosting_refits_up_to_its_best_stage():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(600, 5))
+    y = X @ rng.normal(size=5) + rng.normal(scale=0.5, size=600)
+    monitor = ValidationMonitor(X[500:], y[500:], rounds=20)
+    model = GradientBoostingRegressor(n_estimators=500, learning_rate=0.3, random_state=0)
+    model.fit(X[:500], y[:500], monitor=monitor)
+
+    best = monitor._best_stage + 1
+    assert model.n_estimators_ == best + 20
+    assert monitor.best_iterations(model) == best
+    # A fresh copy, as in the parent of a worker process, finds the same stage.
+    assert pickle.loads(pickle.dumps(ValidationMonitor(X[500:], y[500:], 20))).best_iterations(model) == best
+    assert _refit_params(model, best) == {"n_estimators": best}
@@ -0,0 +1,90 @@
+import os
+
+from sklearn.linear_model import Ridge
+
+from src.pipeline import prediction_cache
+from src.pipeline.model_registry import ModelRegistry, ModelRegistryConfig
+from src.pipeline.predict_pipeline import PredictPipeline, normalize_record
+from src.pipeline.prediction_cache import PredictionCache, PredictionCacheConfig
+from src.utils import save_object, write_artifacts_manifest
+
+RECORD = {
+    "gender": "female",
+    "race_ethnicity": "group B",
+    "parental_level_of_education": "bachelor's degree",
+    "lunch": "standard",
+    "test_preparation_course": "none",
+    "reading_score": 72,
+    "writing_score": 74,
+}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(PredictionCacheConfig(max_size=2))
+    cache.put("a", "v1", 1.0)
+    cache.put("b", "v1", 2.0)
+    assert cache.get("a", "v1") == 1.0
+    cache.put("c", "v1", 3.0)
+
+    assert cache.get("b", "v1") is None
+    assert cache.get("a", "v1") == 1.0 and cache.get("c", "v1") == 3.0
+    stats = cache.stats()
+    assert (stats["size"], stats["evictions"], stats["hits"], stats["misses"]) == (2, 1, 3, 1)
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(prediction_cache.time, "monotonic", lambda: now[0])
+    cache = PredictionCache(PredictionCacheConfig(ttl_seconds=60))
+    cache.put("a", "v1", 1.0)
+
+    now[0] += 59
+    assert cache.get("a", "v1") == 1.0
+    now[0] += 2
+    assert cache.get("a", "v1") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_other_versions_miss():
+    cache = PredictionCache()
+    cache.put("a", "v1", 1.0)
+    assert cache.get("a", "v2") is None
+    assert cache.get("a", "v1") is None
+
+
+def test_equivalent_records_share_a_key():
+    assert normalize_record(RECORD) == normalize_record(
+        RECORD | {"gender": " female ", "reading_score": "72", "writing_score": 74.0})
+
+
+def test_reload_invalidates_the_cache(tmp_path, fitted_pair, student_frame, features):
+    config = ModelRegistryConfig(
+        model_path=str(tmp_path / "model.pkl"),
+        preprocessor_path=str(tmp_path / "preprocessor.pkl"),
+        manifest_path=str(tmp_path / "manifest.json"),
+        use_prediction_table=False,
+    )
+
+    def publish(model):
+        save_object(config.preprocessor_path, fitted_pair[0])
+        save_object(config.model_path, model)
+        write_artifacts_manifest(config.manifest_path, model=config.model_path,
+                                 preprocessor=config.preprocessor_path)
+        stat = os.stat(config.manifest_path)
+        os.utime(config.manifest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    publish(fitted_pair[1])
+    cache = PredictionCache()
+    pipeline = PredictPipeline(registry=ModelRegistry(config), cache=cache)
+    first = pipeline.predict_record(RECORD)
+    assert pipeline.predict_record(dict(RECORD, gender=" female")) == first
+    assert cache.stats()["hits"] == 1
+    invalidations = cache.stats()["invalidations"]
+
+    # A much stronger penalty gives visibly different predictions.
+    publish(Ridge(alpha=1e4).fit(fitted_pair[0].transform(features), student_frame["math_score"]))
+    assert pipeline.registry.refresh() is True
+    assert cache.stats()["size"] == 0 and cache.stats()["invalidations"] == invalidations + 1
+    second = pipeline.predict_record(RECORD)
+    assert second != first
+    assert cache.get(normalize_record(RECORD), pipeline.registry.get().version) == second
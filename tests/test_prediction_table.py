@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder
+
+from src.components.prediction_table import PredictionTable, PredictionTableBuilder, PredictionTableConfig
+from src.schema import STUDENT_SCHEMA
+from src.utils import save_object
+
+# Scores are stored as float32.
+RTOL, ATOL = 1e-6, 1e-4
+
+
+def _config(tmp_path):
+    # A narrow score range keeps the grid small: 240 category combinations x 21 x 21.
+    return PredictionTableConfig(
+        model_file_path=str(tmp_path / "model.pkl"),
+        preprocessor_file_path=str(tmp_path / "preprocessor.pkl"),
+        table_file_path=str(tmp_path / "prediction_table.npy"),
+        metadata_file_path=str(tmp_path / "prediction_table.json"),
+        min_score=40,
+        max_score=60,
+    )
+
+
+def _build(tmp_path, preprocessor, model):
+    config = _config(tmp_path)
+    save_object(config.preprocessor_file_path, preprocessor)
+    save_object(config.model_file_path, model)
+    PredictionTableBuilder(config).initiate_prediction_table()
+    return config
+
+
+def _grid_rows(features):
+    rows = features[(features["reading_score"].between(40, 60)) & (features["writing_score"].between(40, 60))]
+    assert len(rows) > 50
+    return rows
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory, fitted_pair):
+    config = _build(tmp_path_factory.mktemp("table"), *fitted_pair)
+    return PredictionTable.load(config)
+
+
+def test_lookup_matches_the_model(table, fitted_pair, features):
+    preprocessor, model = fitted_pair
+    rows = _grid_rows(features)
+    expected = model.predict(preprocessor.transform(rows))
+
+    np.testing.assert_allclose([table.lookup(record) for record in rows.astype(object).to_dict("records")],
+                               expected, rtol=RTOL, atol=ATOL)
+    preds, hits = table.lookup_frame(rows)
+    assert hits.all()
+    np.testing.assert_allclose(preds, expected, rtol=RTOL, atol=ATOL)
+
+
+def test_off_grid_records_miss(table, features):
+    record = _grid_rows(features).astype(object).to_dict("records")[0]
+    misses = [
+        record | {"reading_score": 39.0},
+        record | {"writing_score": 50.5},
+        record | {"lunch": "caviar"},
+        record | {"gender": None},
+    ]
+    assert all(table.lookup(miss) is None for miss in misses)
+
+    preds, hits = table.lookup_frame(pd.DataFrame([record] + misses))
+    assert hits.tolist() == [True, False, False, False, False]
+    assert not np.isnan(preds[0]) and np.isnan(preds[1:]).all()
+
+
+def test_version_mismatch_is_ignored(tmp_path, fitted_pair):
+    config = _build(tmp_path, *fitted_pair)
+    assert PredictionTable.load(config, expected_version="0" * 16) is None
+    assert PredictionTable.load(config) is not None
+
+
+def test_axes_come_from_the_fitted_encoders(tmp_path, student_frame, features):
+    # Fitted "passthrough" is a FunctionTransformer in recent sklearn releases.
+    preprocessor = ColumnTransformer([
+        ("num", "passthrough", STUDENT_SCHEMA.numerical_columns),
+        ("cat", OneHotEncoder(), STUDENT_SCHEMA.categorical_columns),
+    ]).fit(features)
+    model = LinearRegression().fit(preprocessor.transform(features), student_frame["math_score"])
+    table = PredictionTable.load(_build(tmp_path, preprocessor, model))
+
+    rows = _grid_rows(features)
+    preds, hits = table.lookup_frame(rows)
+    assert hits.all()
+    np.testing.assert_allclose(preds, model.predict(preprocessor.transform(rows)), rtol=RTOL, atol=ATOL)
+
+
+def test_unbounded_inputs_skip_the_table(tmp_path, student_frame, features):
+    preprocessor = ColumnTransformer([
+        ("num", "passthrough", STUDENT_SCHEMA.numerical_columns),
+        ("cat", OrdinalEncoder(), STUDENT_SCHEMA.categorical_columns),
+    ]).fit(features)
+    model = LinearRegression().fit(preprocessor.transform(features), student_frame["math_score"])
+    config = _build(tmp_path, preprocessor, model)
+
+    assert not os.path.exists(config.metadata_file_path)
+    assert PredictionTable.load(config) is None
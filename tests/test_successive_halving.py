@@ -0,0 +1,46 @@
+import numpy as np
+from sklearn.dummy import DummyRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.tree import DecisionTreeRegressor
+
+from src.components.successive_halving import SuccessiveHalving, SuccessiveHalvingConfig
+
+
+def _data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(1000, 4))
+    y = X @ np.array([3.0, -2.0, 1.0, 0.5]) + rng.normal(scale=0.1, size=1000)
+    return X[:800], y[:800], X[800:], y[800:]
+
+
+def test_rungs_narrow_the_candidates_on_growing_samples():
+    X_train, y_train, X_test, y_test = _data()
+    models = {
+        "Linear Regression": LinearRegression(),
+        "Stump": DecisionTreeRegressor(max_depth=1),
+        "Mean": DummyRegressor(),
+    }
+    halving = SuccessiveHalving(SuccessiveHalvingConfig(min_samples=100))
+    report, fitted = halving.run(models, X_train, y_train, X_test, y_test)
+
+    assert [rung["sample_size"] for rung in halving.rungs] == [100, 200, 800]
+    assert [sorted(rung["scores"]) for rung in halving.rungs] == [
+        sorted(models), ["Linear Regression", "Stump"], ["Linear Regression"]]
+    assert halving.rows_fitted() == 3 * 100 + 2 * 200 + 800
+
+    # The finalist is trained on every training row, not on the last subsample.
+    assert list(report) == list(fitted) == ["Linear Regression"]
+    np.testing.assert_allclose(fitted["Linear Regression"].coef_,
+                               LinearRegression().fit(X_train, y_train).coef_)
+    # The candidates passed in are left unfitted.
+    assert not hasattr(models["Linear Regression"], "coef_")
+
+
+def test_small_training_sets_go_straight_to_full_selection():
+    X_train, y_train, X_test, y_test = _data()
+    halving = SuccessiveHalving(SuccessiveHalvingConfig(min_samples=5000))
+    report, _ = halving.run({"Linear Regression": LinearRegression(), "Mean": DummyRegressor()},
+                            X_train, y_train, X_test, y_test)
+
+    assert [rung["sample_size"] for rung in halving.rungs] == [800]
+    assert sorted(report) == ["Linear Regression", "Mean"]
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from src.components.data_injection import DataIngestion
+from src.components.model_trainer import ModelTrainer
+from src.pipeline.train_pipeline import Stage, TrainPipeline, TrainPipelineConfig, _source_files
+
+
+class _Pipeline:
+    """
+    Two file-based stages, source -> upper -> count, that record their runs.
+    """
+
+    def __init__(self, tmp_path, params="v1"):
+        self.source = str(tmp_path / "source.txt")
+        self.upper = str(tmp_path / "upper.txt")
+        self.count = str(tmp_path / "count.txt")
+        self.runs = []
+        self.pipeline = TrainPipeline(TrainPipelineConfig(state_file_path=str(tmp_path / "state.json")))
+        self.pipeline.stages = {
+            "upper": Stage("upper", [self.source], [self.upper], self._upper, params=params),
+            "count": Stage("count", [self.upper], [self.count], self._count, depends_on=["upper"]),
+        }
+
+    def _upper(self):
+        self.runs.append("upper")
+        with open(self.source) as src, open(self.upper, "w") as dst:
+            dst.write(src.read().upper())
+
+    def _count(self):
+        self.runs.append("count")
+        with open(self.upper) as src, open(self.count, "w") as dst:
+            dst.write(str(len(src.read().split())))
+
+    def run(self, *args, **kwargs):
+        self.runs.clear()
+        return {name: result["status"] for name, result in self.pipeline.run(*args, **kwargs).items()}
+
+
+def test_unchanged_stages_are_skipped(tmp_path):
+    pipeline = _Pipeline(tmp_path)
+    with open(pipeline.source, "w") as file_obj:
+        file_obj.write("a b c")
+
+    assert pipeline.run() == {"upper": "ran", "count": "ran"}
+    assert pipeline.run() == {"upper": "skipped", "count": "skipped"}
+    assert pipeline.runs == []
+    assert pipeline.run(force=True) == {"upper": "ran", "count": "ran"}
+
+
+def test_changed_input_reruns_downstream_only_when_outputs_change(tmp_path):
+    pipeline = _Pipeline(tmp_path)
+    with open(pipeline.source, "w") as file_obj:
+        file_obj.write("a b c")
+    pipeline.run()
+
+    with open(pipeline.source, "w") as file_obj:
+        file_obj.write("a b c d")
+    assert pipeline.run() == {"upper": "ran", "count": "ran"}
+
+    # Same upper-cased output: the downstream stage stays up to date.
+    with open(pipeline.source, "w") as file_obj:
+        file_obj.write("A b C d")
+    assert pipeline.run() == {"upper": "ran", "count": "skipped"}
+
+
+def test_changed_params_or_missing_outputs_rerun(tmp_path):
+    pipeline = _Pipeline(tmp_path)
+    with open(pipeline.source, "w") as file_obj:
+        file_obj.write("a b c")
+    pipeline.run()
+
+    os.remove(pipeline.count)
+    assert pipeline.run() == {"upper": "skipped", "count": "ran"}
+
+    with open(pipeline.count, "w") as file_obj:
+        file_obj.write("edited by hand")
+    assert pipeline.run(["count"]) == {"upper": "skipped", "count": "ran"}
+
+    assert _Pipeline(tmp_path, params="v2").run() == {"upper": "ran", "count": "skipped"}
+
+
+def test_missing_inputs_fail_the_stage(tmp_path):
+    with pytest.raises(Exception):
+        _Pipeline(tmp_path).run()
+
+
+def test_stage_inputs_cover_imported_src_modules():
+    files = [path.replace(os.sep, "/") for path in _source_files(ModelTrainer)]
+    for module in ("components/model_trainer.py", "components/hyperparameter_search.py", "utils.py",
+                   "thread_budget.py"):
+        assert any(path.endswith(f"src/{module}") for path in files), module
+
+    # Imports under `if __name__ == "__main__":` are not dependencies.
+    files = _source_files(DataIngestion)
+    assert not any(path.endswith("train_pipeline.py") for path in files)